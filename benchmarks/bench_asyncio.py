@@ -0,0 +1,69 @@
+# coding: utf-8
+"""
+Measure the event loop latency while a 10k article issue table renders,
+inline with format_many and with aformat_many.
+
+Usage: PYTHONPATH=. python benchmarks/bench_asyncio.py [records]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.sample import records
+from legendarium.aio import aformat_many
+from legendarium.formatter import format_many
+
+STYLE = 'descriptive_html'
+
+
+async def ticker(lags, interval=0.001):
+
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def inline(data):
+
+    await asyncio.sleep(0)
+    return list(format_many(data, STYLE))
+
+
+async def offloaded(data):
+
+    return [legend async for legend in aformat_many(data, STYLE, slice_size=250)]
+
+
+async def measure(function, data):
+
+    lags = []
+    task = asyncio.ensure_future(ticker(lags))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    result = await function(data)
+    elapsed = time.perf_counter() - start
+
+    # Let the ticker record the lag of a blocked loop
+    await asyncio.sleep(0.01)
+    task.cancel()
+    lags.sort()
+
+    return len(result), elapsed, lags[len(lags) // 2], lags[-1]
+
+
+def main(count=10000):
+
+    data = list(records(count))
+
+    print('%-12s %8s %10s %12s %10s' % ('mode', 'records', 'total', 'median lag', 'max lag'))
+
+    for name, function in (('inline', inline), ('aformat_many', offloaded)):
+        rendered, elapsed, median, worst = asyncio.run(measure(function, data))
+        print('%-12s %8d %8.1fms %10.2fms %8.1fms' % (
+            name, rendered, elapsed * 1e3, median * 1e3, worst * 1e3))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,55 @@
+# coding: utf-8
+"""
+Compare format_many and CitationBatch with a loop calling the format
+function per record. The batch is built from columns, as they come from a
+columnar source.
+
+Usage: PYTHONPATH=. python benchmarks/bench_format_many.py
+"""
+import time
+
+from benchmarks.sample import records
+from legendarium.batch import CitationBatch
+from legendarium.formatter import STYLES, format_many
+
+COUNT = 200000
+
+
+def naive(style, rows):
+
+    function = STYLES[style][0]
+
+    return [function(**row) for row in rows]
+
+
+def batch(style, rows):
+
+    return list(format_many(rows, style))
+
+
+def columnar(style, columns):
+
+    return CitationBatch(**columns).render(style)
+
+
+def main():
+
+    print('%-28s %12s %12s %12s' % ('style', 'loop', 'format_many', 'batch'))
+
+    for style in ('very_short', 'descriptive', 'descriptive_html'):
+        fields = STYLES[style][1]
+        rows = [dict([(k, v) for k, v in row.items() if k in fields]) for row in records(COUNT)]
+        timings = []
+
+        columns = dict([(field, [row[field] for row in rows]) for field in fields])
+
+        for function, data in ((naive, rows), (batch, rows), (columnar, columns)):
+            start = time.perf_counter()
+            function(style, data)
+            timings.append(COUNT / (time.perf_counter() - start))
+
+        print('%-28s %10.0f/s %10.0f/s %10.0f/s' % tuple([style] + timings))
+
+
+if __name__ == '__main__':
+    main()
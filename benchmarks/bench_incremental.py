@@ -0,0 +1,79 @@
+# coding: utf-8
+"""
+Compare a full command line render of a collection with an incremental run
+after 1% of its records changed.
+
+Usage: PYTHONPATH=. python benchmarks/bench_incremental.py
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from legendarium import cli, incremental
+
+COUNT = 50000
+
+RECORDS = [
+    {
+        'pid': 'S%06d' % i,
+        'acron': 'rmes',
+        'title': u'Revista Mal-Estar Subjetivo',
+        'short_title': u'Rev.Mal-Estar Subj',
+        'pubdate': u'%d-%02d' % (1990 + i // 4000, i // 400 % 12 + 1),
+        'year_pub': str(1990 + i // 4000),
+        'volume': str(i // 400),
+        'number': str(i // 100 % 4 + 1),
+        'fpage': str(i % 100 * 10 + 1),
+        'lpage': str(i % 100 * 10 + 9)
+    }
+    for i in range(COUNT)
+]
+
+ARGUMENTS = [
+    '-s', 'descriptive', '-s', 'descriptive_html', '-s', 'very_short', '-l', 'pt',
+    '-l', 'es', '-l', 'en', '-u', 'url_article', '-o', os.devnull
+]
+
+
+def write(records, path):
+
+    with open(path, 'w') as stream:
+        for record in records:
+            stream.write(json.dumps(record) + '\n')
+
+
+def timed(function, arguments):
+
+    start = time.perf_counter()
+    function(arguments)
+
+    return time.perf_counter() - start
+
+
+def main():
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'records.jsonl')
+    manifest = os.path.join(directory, 'manifest.tsv')
+
+    write(RECORDS, path)
+    incremental.main([path, '--manifest', manifest] + ARGUMENTS)
+
+    changed = [dict(record) for record in RECORDS]
+    for record in changed[::100]:
+        record['lpage'] = str(int(record['lpage']) + 1)
+    write(changed, path)
+
+    full = timed(cli.main, [path, '-k', 'pid'] + ARGUMENTS)
+    delta = timed(incremental.main, [path, '--manifest', manifest] + ARGUMENTS)
+
+    print('%-24s %8.2fs' % ('full render', full))
+    print('%-24s %8.2fs' % ('incremental, 1% changed', delta))
+
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
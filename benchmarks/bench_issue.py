@@ -0,0 +1,48 @@
+# coding: utf-8
+"""
+Compare rendering the table of contents of a 300 article issue with
+descriptive_format and with an IssueLegend.
+
+Usage: PYTHONPATH=. python benchmarks/bench_issue.py
+"""
+import timeit
+
+from legendarium.formatter import descriptive_format, descriptive_html_format
+from legendarium.issue import IssueLegend
+
+ISSUE = ('Revista Mal-Estar Subjetivo', 'Rev.Mal-Estar Subj', '2011-12-31', '67', '9')
+PAGES = [(str(i * 10), str(i * 10 + 9), '') for i in range(1, 301)]
+
+
+def with_functions(function, style):
+
+    return [
+        function(*ISSUE, fpage=fpage, lpage=lpage, elocation=elocation, language='pt')
+        for fpage, lpage, elocation in PAGES
+    ]
+
+
+def with_issue_legend(function, style):
+
+    legend = IssueLegend(*ISSUE, language='pt')
+
+    return [legend.article(fpage, lpage, elocation, style) for fpage, lpage, elocation in PAGES]
+
+
+def main(number=200):
+
+    print('%-18s %14s %14s' % ('style', 'functions', 'IssueLegend'))
+
+    for function, style in ((descriptive_format, 'descriptive'),
+                            (descriptive_html_format, 'descriptive_html')):
+        assert with_functions(function, style) == with_issue_legend(function, style)
+
+        timings = [
+            timeit.timeit(lambda: run(function, style), number=number) / number * 1e3
+            for run in (with_functions, with_issue_legend)
+        ]
+        print('%-18s %12.2fms %12.2fms' % tuple([style] + timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# coding: utf-8
+"""
+Measure the memory and time of loading a collection of JSON records into
+CitationFormatter instances with raw title fields and with a shared
+JournalContext per journal.
+
+Usage: PYTHONPATH=. python benchmarks/bench_journal.py
+"""
+import json
+import time
+import tracemalloc
+
+from legendarium.formatter import CitationFormatter
+from legendarium.journal import JournalContext
+
+COUNT = 100000
+
+JOURNALS = [
+    ('Revista Mal-Estar Subjetivo ', 'Rev.Mal-Estar Subj', 'rmes'),
+    ('Revista de Saude Publica', 'Rev. Saude Publica ', 'rsp'),
+    ('Cadernos de Saude Publica', 'Cad. Saude Publica', 'csp')
+]
+
+LINES = [
+    json.dumps({
+        'title': JOURNALS[i % 3][0], 'short_title': JOURNALS[i % 3][1],
+        'acron': JOURNALS[i % 3][2], 'pubdate': '2011', 'volume': '67',
+        'number': str(i % 12), 'fpage': str(i), 'lpage': str(i + 10)
+    })
+    for i in range(COUNT)
+]
+
+
+def raw(record, journals):
+
+    return CitationFormatter(
+        record['title'], record['short_title'], record['pubdate'], record['volume'],
+        record['number'], record['fpage'], record['lpage']
+    )
+
+
+def shared(record, journals):
+
+    journal = journals.get(record['acron'])
+
+    if journal is None:
+        journal = journals[record['acron']] = JournalContext(
+            record['title'], record['short_title'], record['acron']
+        )
+
+    return CitationFormatter(
+        '', '', record['pubdate'], record['volume'], record['number'], record['fpage'],
+        record['lpage'], journal=journal
+    )
+
+
+def load(factory):
+
+    records = [json.loads(line) for line in LINES]
+
+    journals = {}
+    start = time.perf_counter()
+    citations = [factory(record, journals) for record in records]
+    elapsed = time.perf_counter() - start
+    del citations
+
+    # The records are parsed again so that each one owns its strings
+    journals = {}
+    tracemalloc.start()
+    citations = [factory(json.loads(line), journals) for line in LINES]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del citations
+
+    return size / COUNT, elapsed / COUNT * 1e6
+
+
+def main():
+
+    print('%-10s %12s %12s' % ('titles', 'memory', 'time'))
+
+    for name, factory in (('raw', raw), ('journal', shared)):
+        print('%-10s %10.0f B %10.2fus' % ((name,) + load(factory)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# coding: utf-8
+"""
+Measure the per-instance memory of CitationFormatter and URLegendarium with
+and without __slots__.
+
+Usage: PYTHONPATH=. python benchmarks/bench_memory.py
+"""
+import tracemalloc
+
+from legendarium.formatter import CitationFormatter
+from legendarium.urlegendarium import URLegendarium
+
+COUNT = 100000
+
+
+def unslotted(cls):
+    """
+    Return a copy of cls keeping its instances attributes in a __dict__.
+    """
+    namespace = dict(
+        [(k, v) for k, v in vars(cls).items() if k != '__slots__' and k not in cls.__slots__]
+    )
+
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def per_instance(factory):
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [factory(i) for i in range(COUNT)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del instances
+
+    return size / COUNT
+
+
+def citation(cls):
+
+    return lambda i: cls(
+        title='Revista Mal-Estar Subjetivo', short_title='Rev.Mal-Estar Subj',
+        pubdate='2011', volume='67', number='9', fpage='154', lpage='200',
+        elocation='e00120416', suppl='3'
+    )
+
+
+def urlegendarium(cls):
+
+    return lambda i: cls(
+        acron='spm', year_pub='2011', volume='67', number='9', fpage='154',
+        lpage='200', article_id='e00120416', suppl_number='3'
+    )
+
+
+def main():
+
+    print('%-20s %10s %10s' % ('class', 'dict', 'slots'))
+
+    for cls, factory in ((CitationFormatter, citation), (URLegendarium, urlegendarium)):
+        before = per_instance(factory(unslotted(cls)))
+        after = per_instance(factory(cls))
+        print('%-20s %8.0f B %8.0f B' % (cls.__name__, before, after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# coding: utf-8
+"""
+Measure render_parallel throughput for an increasing number of processes.
+
+Usage: PYTHONPATH=. python benchmarks/bench_parallel.py [records]
+"""
+import os
+import sys
+import time
+
+from benchmarks.sample import records
+from legendarium.formatter import format_many
+from legendarium.parallel import render_parallel
+
+STYLE = 'descriptive'
+
+
+def throughput(function, count):
+
+    start = time.perf_counter()
+    for _ in function(records(count)):
+        pass
+
+    return count / (time.perf_counter() - start)
+
+
+def main(count=400000):
+
+    cores = os.cpu_count()
+    serial = throughput(lambda data: format_many(data, STYLE), count)
+
+    print('%d cores, %d records, style %s' % (cores, count, STYLE))
+    print('%-10s %12s %8s' % ('workers', 'records/s', 'speedup'))
+    print('%-10s %12.0f %8.2f' % ('serial', serial, 1))
+
+    workers = 1
+    while workers <= cores:
+        rate = throughput(
+            lambda data: render_parallel(data, STYLE, workers=workers, chunk_size=2000), count
+        )
+        print('%-10d %12.0f %8.2f' % (workers, rate, rate / serial))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
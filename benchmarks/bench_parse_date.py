@@ -0,0 +1,51 @@
+# coding: utf-8
+"""
+Compare parse_date with the previous strptime based implementation.
+
+Usage: PYTHONPATH=. python benchmarks/bench_parse_date.py
+"""
+import timeit
+
+from datetime import datetime
+
+from legendarium import formatter
+
+SAMPLES = ['2011', '2011-12', '2011-12-31']
+
+
+def legacy_parse_date(value):
+
+    try:
+        dt = datetime.strptime(value, '%Y-%m-%d')
+        return dt.isoformat()[:10]
+    except:
+        try:
+            dt = datetime.strptime(value, '%Y-%m')
+            return dt.isoformat()[:7]
+        except:
+            try:
+                dt = datetime.strptime(value, '%Y')
+                return dt.isoformat()[:4]
+            except:
+                raise ValueError(u'Probably not a valid date')
+
+
+def uncached_parse_date(value):
+
+    return formatter._parse_date.__wrapped__(value)
+
+
+def main(number=100000):
+
+    print('%-12s %12s %12s %12s' % ('pubdate', 'legacy', 'uncached', 'parse_date'))
+
+    for sample in SAMPLES:
+        timings = [
+            timeit.timeit(lambda: function(sample), number=number) / number * 1e6
+            for function in (legacy_parse_date, uncached_parse_date, formatter.parse_date)
+        ]
+        print('%-12s %10.2fus %10.2fus %10.2fus' % tuple([sample] + timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# coding: utf-8
+"""
+Compare a nightly style re-render of a collection without a LegendStore, with
+an empty one and with one filled by the previous run, through format_many
+and through the command line with several styles and languages.
+
+Usage: PYTHONPATH=. python benchmarks/bench_store.py
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from legendarium.cli import main as cli
+from legendarium.formatter import format_many
+from legendarium.store import LegendStore
+
+COUNT = 50000
+
+RECORDS = [
+    {
+        'pid': 'S%06d' % i,
+        'title': u'Revista Mal-Estar Subjetivo',
+        'short_title': u'Rev.Mal-Estar Subj',
+        'pubdate': u'%d-%02d' % (1990 + i // 4000, i // 400 % 12 + 1),
+        'volume': str(i // 400),
+        'number': str(i // 100 % 4 + 1),
+        'fpage': str(i % 100 * 10 + 1),
+        'lpage': str(i % 100 * 10 + 9),
+        'elocation': u'',
+        'suppl': u''
+    }
+    for i in range(COUNT)
+]
+
+CLI_ARGUMENTS = [
+    '-k', 'pid', '-s', 'descriptive', '-s', 'descriptive_html', '-s', 'very_short',
+    '-s', 'short', '-l', 'pt', '-l', 'es', '-l', 'en', '-o', os.devnull
+]
+
+
+def run_format_many(store, path):
+
+    for style in ('descriptive', 'descriptive_html'):
+        for legend in format_many(RECORDS, style, 'pt', store=store):
+            pass
+
+
+def run_cli(store, path):
+
+    cli([path] + CLI_ARGUMENTS + (['--cache', store.path] if store is not None else []))
+
+
+def main():
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'records.jsonl')
+
+    with open(path, 'w') as stream:
+        for record in RECORDS:
+            stream.write(json.dumps(record) + '\n')
+
+    print('%-14s %14s %14s %14s' % ('records/s', 'no store', 'empty store', 'filled store'))
+
+    for name, run in (('format_many', run_format_many), ('command line', run_cli)):
+        database = os.path.join(directory, '%s.db' % run.__name__)
+        timings = []
+
+        for store in (None, LegendStore(database), LegendStore(database)):
+            start = time.perf_counter()
+            run(store, path)
+            timings.append(COUNT / (time.perf_counter() - start))
+
+            if store is not None:
+                store.close()
+
+        print('%-14s %12.0f/s %12.0f/s %12.0f/s' % tuple([name] + timings))
+
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
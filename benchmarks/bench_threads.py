@@ -0,0 +1,55 @@
+# coding: utf-8
+"""
+Stress render_threaded: for every thread count, the same records are
+rendered in three languages at once by concurrent render_threaded calls,
+one per language with that many threads each, sharing the template and
+date caches. The results are checked against a serial run.
+
+On free-threaded CPython (3.13t and later) the throughput should grow with
+the number of threads, with the GIL it stays flat.
+
+Usage: PYTHONPATH=. python benchmarks/bench_threads.py [records]
+"""
+import os
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.sample import records
+from legendarium.formatter import format_many
+from legendarium.parallel import render_threaded
+
+STYLE = 'descriptive'
+LANGUAGES = ('pt', 'es', 'en')
+
+
+def main(count=100000):
+
+    data = list(records(count))
+    expected = dict([(language, list(format_many(data, STYLE, language))) for language in LANGUAGES])
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+
+    print('%d cores, GIL %s, %d records x %d languages' % (
+        os.cpu_count(), 'enabled' if gil else 'disabled', count, len(LANGUAGES)))
+    print('%-10s %12s %8s' % ('threads', 'records/s', 'speedup'))
+
+    base = None
+    threads = 1
+    while threads <= max(os.cpu_count(), 4):
+        def render(language):
+            return list(render_threaded(data, STYLE, language, workers=threads, chunk_size=500))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(len(LANGUAGES)) as executor:
+            results = dict(zip(LANGUAGES, executor.map(render, LANGUAGES)))
+        for language in LANGUAGES:
+            assert results[language] == expected[language], 'wrong results with %d threads' % threads
+        rate = count * len(LANGUAGES) / (time.perf_counter() - start)
+        base = base or rate
+        print('%-10d %12.0f %8.2f' % (threads, rate, rate / base))
+        threads *= 2
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
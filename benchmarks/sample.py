@@ -0,0 +1,27 @@
+# coding: utf-8
+"""
+Sample records shared by the benchmarks.
+"""
+
+
+def records(count, per_issue=20):
+    """
+    Yield count article dicts sorted by issue, as they come from a collection
+    dump, with the fields of the format functions and of URLegendarium.
+    """
+
+    for i in range(count):
+        issue, article = divmod(i, per_issue)
+        yield {
+            'acron': 'rmes',
+            'title': 'Revista Mal-Estar Subjetivo',
+            'short_title': 'Rev.Mal-Estar Subj',
+            'pubdate': '%d-%02d' % (1990 + issue % 30, 1 + issue % 12),
+            'year_pub': str(1990 + issue % 30),
+            'volume': str(issue // 4),
+            'number': str(issue % 4 + 1),
+            'fpage': str(article * 12 + 1),
+            'lpage': str(article * 12 + 12),
+            'elocation': '',
+            'suppl': '' if issue % 7 else '1'
+        }
@@ -0,0 +1,91 @@
+# coding: utf-8
+import asyncio
+
+from collections import deque
+
+from legendarium.parallel import (
+    check_style,
+    collect_errors,
+    render_chunk,
+    render_chunk_lenient
+)
+
+SLICE_SIZE = 500
+
+
+async def aslices(records, slice_size=SLICE_SIZE):
+    """
+    Split an async (or plain) iterable of records into lists of at most
+    slice_size records.
+    """
+
+    chunk = []
+
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            chunk.append(record)
+
+            if len(chunk) >= slice_size:
+                yield chunk
+                chunk = []
+    else:
+        for record in records:
+            chunk.append(record)
+
+            if len(chunk) >= slice_size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+async def aformat_many(records, style, language='en', slice_size=SLICE_SIZE, concurrency=2,
+                       executor=None, errors=None):
+    """
+    Render an async (or plain) iterable of records in one of the formatter
+    STYLES or URL_STYLES without blocking the event loop, yielding the
+    results in the input order.
+
+    Records are rendered in slices on an executor (the loop default one
+    unless given). At most concurrency slices are rendering or waiting to be
+    consumed, and no more records are read until the consumer catches up.
+    Give a list as errors to run in lenient mode, see format_many.
+
+    Example:
+        async for legend in aformat_many(records, 'descriptive', 'pt'):
+            ...
+    """
+
+    check_style(style)
+
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    function = render_chunk if errors is None else render_chunk_lenient
+    consumed = 0
+
+    def results(chunk):
+
+        if errors is None:
+            return chunk
+
+        return collect_errors(chunk, errors, consumed)
+
+    try:
+        async for chunk in aslices(records, slice_size):
+            pending.append(loop.run_in_executor(executor, function, chunk, style, language))
+
+            if len(pending) >= concurrency:
+                chunk = await pending.popleft()
+                for result in results(chunk):
+                    yield result
+                consumed += len(chunk)
+
+        while pending:
+            chunk = await pending.popleft()
+            for result in results(chunk):
+                yield result
+            consumed += len(chunk)
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,275 @@
+# coding: utf-8
+from array import array
+from itertools import repeat
+from operator import or_
+
+from legendarium.formatter import (
+    ARTICLE_FIELDS,
+    STYLES,
+    STYLE_TEMPLATES,
+    _check_styles,
+    _parse_date_parts,
+    descriptive_date,
+    join_pages
+)
+
+# Placeholders rendered straight from a normalized column
+PLACEHOLDER_FIELDS = {
+    '%T': 'title',
+    '%t': 'short_title',
+    '%v': 'volume',
+    '%n': 'number',
+    '%f': 'fpage',
+    '%l': 'lpage',
+    '%e': 'elocation'
+}
+
+
+class CitationBatch(object):
+    """
+    Citation fields stored by column, for rendering many legends at once.
+
+    Every distinct value is kept once in a string table and the columns hold
+    codes into it, so the repeated titles, dates and issue fields of a
+    collection are normalized, parsed and tested for presence once per
+    distinct value instead of once per row. Rows are then grouped by their
+    template and rendered group by group, with the same output as the
+    format functions.
+
+    Columns may be any sequence (lists, tuples, NumPy object or string
+    arrays) and must all have the same length. Missing columns are empty.
+    The journal column holds JournalContext instances used in place of the
+    titles of their rows, or None.
+    """
+
+    def __init__(self, title=None, short_title=None, pubdate=None, volume=None,
+                 number=None, fpage=None, lpage=None, elocation=None, suppl=None,
+                 journal=None):
+
+        given = dict([
+            (field, column) for field, column in zip(ARTICLE_FIELDS, (
+                title, short_title, pubdate, volume, number, fpage, lpage,
+                elocation, suppl
+            )) if column is not None
+        ])
+
+        lengths = set([len(column) for column in given.values()])
+
+        if journal is not None:
+            lengths.add(len(journal))
+
+        if len(lengths) > 1:
+            raise ValueError(u'All the columns must have the same length')
+
+        self._length = lengths.pop() if lengths else 0
+
+        if journal is not None:
+            for field in ('title', 'short_title'):
+                column = given.get(field, repeat(''))
+                given[field] = [
+                    getattr(context, field) if context else value
+                    for context, value in zip(journal, column)
+                ]
+
+        # Code 0 stands for every empty value
+        self._values = ['']
+        self._index = {}
+        self._columns = {}
+
+        for field in ARTICLE_FIELDS:
+            if field in given:
+                self._columns[field] = self._encode(given[field])
+            else:
+                self._columns[field] = array('I', [0]) * self._length
+
+        self._normalized = None
+        self._dates = None
+        self._value_columns = {}
+        self._flags = None
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build a batch from dicts with the format functions arguments,
+        journal included.
+        """
+
+        records = list(records)
+        columns = dict([
+            (field, [record.get(field, '') for record in records]) for field in ARTICLE_FIELDS
+        ])
+        journal = [record.get('journal') for record in records]
+
+        if any(journal):
+            columns['journal'] = journal
+
+        return cls(**columns)
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return "%s.%s(%d rows, %d distinct values)" % (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self._length,
+            len(self._values)
+        )
+
+    def _encode(self, column):
+
+        index = self._index
+        values = self._values
+
+        # Equal values of other types may render differently (67.0 and 67),
+        # so values that are not text are indexed with their type
+        if set(map(type, column)) <= set([str]):
+            keys = column
+            distinct = dict.fromkeys(column)
+            distinct = zip(distinct, distinct)
+        else:
+            keys = [
+                value if isinstance(value, str) else (value.__class__, value)
+                for value in column
+            ]
+            distinct = dict(zip(keys, column)).items()
+
+        for key, value in distinct:
+            if value and key not in index:
+                index[key] = len(values)
+                values.append(value)
+
+        # Empty values are not in the index and get code 0
+        return array('I', map(index.get, keys, repeat(0)))
+
+    @property
+    def strings(self):
+        """
+        The normalized string table, indexed by the column codes.
+        """
+
+        if self._normalized is None:
+            self._normalized = [str(value).strip() if value else '' for value in self._values]
+
+        return self._normalized
+
+    def column(self, field):
+        """
+        Return the normalized values of a field, one per row.
+        """
+
+        strings = self.strings
+
+        return [strings[code] for code in self._columns[field]]
+
+    def dates(self):
+        """
+        Parse each distinct publication date once, raising ValueError for an
+        invalid one as the format functions do.
+
+        return: (dict) code -> (normalized date, month, day)
+        """
+
+        if self._dates is None:
+            self._dates = dict([
+                (code, _parse_date_parts(self._values[code] if code else ''))
+                for code in set(self._columns['pubdate'])
+            ])
+
+        return self._dates
+
+    def _value_column(self, item, language):
+        """
+        Return the column of values of a placeholder, computed once per batch
+        (per language for the descriptive date).
+        """
+
+        key = (item, language) if item == '%D' else item
+
+        if key in self._value_columns:
+            return self._value_columns[key]
+
+        strings = self.strings
+        columns = self._columns
+
+        if item in ('%Y', '%d', '%D'):
+            dates = self.dates()
+
+            if item == '%Y':
+                by_code = dict([(code, date[0][0:4]) for code, date in dates.items()])
+            elif item == '%d':
+                by_code = dict([(code, date[0]) for code, date in dates.items()])
+            else:
+                by_code = dict([
+                    (code, descriptive_date(date[0], date[1], date[2], language))
+                    for code, date in dates.items()
+                ])
+
+            values = [by_code[code] for code in columns['pubdate']]
+        elif item == '%p':
+            values = [
+                join_pages(strings[f], strings[l], strings[e])
+                for f, l, e in zip(columns['fpage'], columns['lpage'], columns['elocation'])
+            ]
+        elif item == '%s':
+            suppl = [value if value != '0' else '' for value in strings]
+            values = [suppl[code] for code in columns['suppl']]
+        else:
+            values = self.column(PLACEHOLDER_FIELDS[item])
+
+        self._value_columns[key] = values
+
+        return values
+
+    def _template_flags(self):
+        """
+        Return the template presence flags of every row, computed column-wise.
+        """
+
+        if self._flags is None:
+            columns = self._columns
+            zero = [value == '0' for value in self._values]
+
+            self._flags = list(zip(
+                map(bool, columns['volume']),
+                map(bool, columns['number']),
+                map(bool, columns['suppl']),
+                map(zero.__getitem__, columns['suppl']),
+                map(bool, map(or_, columns['fpage'], columns['lpage'])),
+                map(bool, columns['elocation'])
+            ))
+
+        return self._flags
+
+    def render(self, style, language='en'):
+        """
+        Render every row in one of the formatter STYLES. Rows with the same
+        values in the style fields are rendered once.
+
+        return: (list) one legend per row, in order
+        """
+
+        _check_styles([style])
+        self.dates()
+
+        keys = list(zip(*[self._columns[field] for field in STYLES[style][1]]))
+
+        # First row of each distinct key
+        first = dict(zip(reversed(keys), range(self._length - 1, -1, -1)))
+
+        flags = self._template_flags()
+        groups = {}
+        for row in first.values():
+            groups.setdefault(flags[row], []).append(row)
+
+        rendered = {}
+
+        for group, rows in groups.items():
+            template = STYLE_TEMPLATES[style](language, group)
+            columns = dict([
+                (item, self._value_column(item, language)) for item in template.placeholders
+            ])
+
+            rendered.update(zip(rows, template.render_rows(columns, rows)))
+
+        return [rendered[first[key]] for key in keys]
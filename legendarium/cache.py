@@ -0,0 +1,85 @@
+# coding: utf-8
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions maxsize currsize')
+
+MISSING = object()
+
+
+class LRUCache(object):
+    """
+    A thread-safe, size-bounded mapping that evicts the least recently used
+    entry and counts its hits, misses and evictions.
+    """
+
+    def __init__(self, maxsize=4096):
+
+        if maxsize < 1:
+            raise ValueError(u'maxsize must be at least 1')
+
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return "%s.%s(%r)" % (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self.info()
+        )
+
+    def get(self, key, default=None):
+        """
+        Return the value of key, marking it as the most recently used, or
+        default when it is not cached.
+        """
+
+        with self._lock:
+            value = self._data.get(key, MISSING)
+
+            if value is MISSING:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key, value):
+        """
+        Cache value for key, evicting the least recently used entry when the
+        cache is full.
+        """
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Remove every entry and reset the statistics.
+        """
+
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self):
+        """
+        return: (CacheInfo) hits, misses, evictions, maxsize and currsize
+        """
+
+        return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._data))
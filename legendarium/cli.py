@@ -0,0 +1,433 @@
+# coding: utf-8
+"""
+Command line renderer: reads records as JSON lines or CSV and writes their
+legends and URLs as JSON lines or CSV, one output row per input record.
+
+    python -m legendarium -s descriptive -s very_short -l pt -l en \\
+        -u url_article -k pid -j 8 articles.jsonl > legends.jsonl
+
+Legend columns are named STYLE_LANGUAGE and URL columns after the URL
+style, kept input columns come first. A JSON lines record may hold its
+journal as {"journal": {"title": ..., "short_title": ..., "acronym": ...}}
+in place of the title, short_title and acron columns.
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from legendarium.formatter import (
+    ARTICLE_FIELDS,
+    RECORD_ERRORS,
+    STYLES,
+    _invalid_field,
+    format_languages
+)
+from legendarium.journal import JournalContext
+from legendarium.languages import LanguageNotFound, labels
+from legendarium.parallel import CHUNK_SIZE, chunks, map_chunks
+from legendarium.store import LegendStore
+from legendarium.urlegendarium import URL_FIELDS, URL_STYLES, URLegendarium
+from legendarium.utils import RecordError
+
+FORMATS = ('jsonl', 'csv')
+
+
+def output_columns(styles, languages, urls, keep=()):
+    """
+    Return the output column names in order.
+    """
+
+    return (
+        list(keep) +
+        ['%s_%s' % (style, language) for style in styles for language in languages] +
+        list(urls)
+    )
+
+
+@lru_cache(maxsize=None)
+def open_store(path):
+    """
+    Return the LegendStore of a database path, opened once per process.
+    """
+
+    return LegendStore(path)
+
+
+def record_journal(journal):
+    """
+    Return the JournalContext of the journal item of a record: a
+    JournalContext or a mapping of its arguments, None when empty.
+    """
+
+    if not journal:
+        return None
+
+    if isinstance(journal, dict):
+        return JournalContext(**journal)
+
+    return journal
+
+
+def stored_legends(chunk, styles, languages, store):
+    """
+    Return the legends of a list of record dicts, one list per record in the
+    output columns order. The legends of a record are stored together,
+    separated by NUL characters, so an unchanged record costs one lookup
+    whatever the number of styles and languages; only the missing records
+    are rendered and written back. Records that fail to render, or are not
+    dicts, get None.
+    """
+
+    rows = [
+        tuple([record.get(field, '') for field in ARTICLE_FIELDS]) + (record.get('journal'),)
+        for record in chunk if isinstance(record, dict)
+    ]
+
+    def render(values):
+
+        try:
+            legends = format_languages(
+                styles, languages, journal=record_journal(values[-1]),
+                **dict(zip(ARTICLE_FIELDS, values))
+            )
+        except RECORD_ERRORS:
+            return None
+
+        return '\x00'.join([legends[language][style] for style in styles for language in languages])
+
+    legends = iter(store.render(
+        ','.join(styles), ','.join(languages), rows, render, ARTICLE_FIELDS + ('journal',)
+    ))
+    stored = []
+
+    for record in chunk:
+        joined = next(legends) if isinstance(record, dict) else None
+        stored.append(joined.split('\x00') if joined is not None else None)
+
+    return stored
+
+
+def invalid_field(record, styles, urls):
+    """
+    Return the field of a record dict that prevents rendering it, None when
+    unknown or when the record is not a dict.
+    """
+
+    if not isinstance(record, dict):
+        return None
+
+    field = None
+
+    try:
+        record_journal(record.get('journal'))
+    except RECORD_ERRORS:
+        return 'journal'
+
+    if styles:
+        field = _invalid_field(ARTICLE_FIELDS, [record.get(name, '') for name in ARTICLE_FIELDS])
+
+    if field is None and urls:
+        field = URLegendarium(
+            journal=record_journal(record.get('journal')),
+            **dict([(name, record[name]) for name in URL_FIELDS if name in record])
+        ).invalid_field()
+
+    return field
+
+
+def render_outputs(chunk, styles, languages, urls, keep=(), cache=None, lenient=False):
+    """
+    Render the legends and URLs of a list of record dicts, returning one
+    output dict per record. This is the unit of work of the -j processes.
+
+    Keyword arguments:
+    cache -- path of a LegendStore database to read the legends from and
+             write the missing ones to
+    lenient -- the output dict of a record that can not be rendered only has
+               the kept columns and an '_error' (field, reason) item, instead
+               of raising
+    """
+
+    output = []
+
+    if cache and styles:
+        names = output_columns(styles, languages, ())
+        stored = stored_legends(chunk, styles, languages, open_store(cache))
+    else:
+        stored = None
+
+    for position, record in enumerate(chunk):
+        try:
+            if isinstance(record, InvalidLine):
+                raise record
+
+            row = dict([(name, record.get(name, '')) for name in keep])
+            journal = record_journal(record.get('journal'))
+
+            if stored is not None and stored[position] is not None:
+                row.update(zip(names, stored[position]))
+            elif styles:
+                legends = format_languages(
+                    styles, languages, journal=journal,
+                    **dict([(field, record[field]) for field in ARTICLE_FIELDS if field in record])
+                )
+
+                for style in styles:
+                    for language in languages:
+                        row['%s_%s' % (style, language)] = legends[language][style]
+
+            if urls:
+                url = URLegendarium(
+                    journal=journal,
+                    **dict([(field, record[field]) for field in URL_FIELDS if field in record])
+                )
+
+                for style in urls:
+                    row[style] = getattr(url, style)
+        except RECORD_ERRORS as exc:
+            if not lenient:
+                raise
+
+            row = dict([
+                (name, record.get(name, '') if isinstance(record, dict) else '')
+                for name in keep
+            ])
+            row['_error'] = (invalid_field(record, styles, urls), str(exc))
+
+        output.append(row)
+
+    return output
+
+
+class InvalidLine(ValueError):
+    """
+    A line of a JSON lines input that does not decode.
+    """
+
+
+def read_records(stream, input_format, lenient=False):
+    """
+    Yield the records of a JSON lines or CSV text stream, one at a time.
+
+    Keyword arguments:
+    lenient -- yield an InvalidLine in place of a line that does not decode,
+               for render_outputs to report, instead of raising it
+    """
+
+    if input_format == 'csv':
+        for record in csv.DictReader(stream):
+            yield record
+    else:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                record = InvalidLine('%s line %d: %s' % (
+                    getattr(stream, 'name', '-'), number, exc
+                ))
+
+                if not lenient:
+                    raise record
+
+            yield record
+
+
+def input_format_of(name, default='jsonl'):
+
+    return 'csv' if name.lower().endswith('.csv') else default
+
+
+def open_inputs(names, input_format=None, lenient=False):
+    """
+    Yield the records of each named file in order, '-' being stdin, see
+    read_records.
+    """
+
+    for name in names:
+        if name == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+            for record in read_records(stream, input_format or 'jsonl', lenient):
+                yield record
+        else:
+            with open(name, encoding='utf-8', newline='') as stream:
+                for record in read_records(
+                        stream, input_format or input_format_of(name), lenient):
+                    yield record
+
+
+def write_rows(rows, stream, output_format, columns):
+    """
+    Write output dicts to a text stream as they come.
+    """
+
+    if output_format == 'csv':
+        writer = csv.DictWriter(stream, columns, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False))
+            stream.write('\n')
+
+
+def parser():
+
+    parser = argparse.ArgumentParser(
+        prog='legendarium',
+        description="Render SciELO bibliographic legends and URLs in bulk."
+    )
+    parser.add_argument(
+        'inputs', nargs='*', default=['-'], metavar='FILE',
+        help="JSON lines or CSV files with one record per line, stdin by default")
+    parser.add_argument(
+        '-f', '--input-format', choices=FORMATS,
+        help="input format, by default csv for .csv files and jsonl otherwise")
+    parser.add_argument(
+        '-o', '--output', default='-', metavar='FILE', help="output file, stdout by default")
+    parser.add_argument(
+        '-t', '--output-format', choices=FORMATS, help="output format, like the input by default")
+    parser.add_argument(
+        '-s', '--style', action='append', dest='styles', choices=sorted(STYLES),
+        help="legend style, may be repeated")
+    parser.add_argument(
+        '-l', '--language', action='append', dest='languages',
+        help="legend language, may be repeated (default: en)")
+    parser.add_argument(
+        '-u', '--url', action='append', dest='urls', default=[], choices=URL_STYLES,
+        help="URLegendarium URL, may be repeated")
+    parser.add_argument(
+        '-k', '--keep', action='append', default=[], metavar='COLUMN',
+        help="input column copied to the output, such as an identifier, may be repeated")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1, metavar='N', help="rendering processes (default: 1)")
+    parser.add_argument(
+        '--chunk-size', type=int, default=CHUNK_SIZE, metavar='N',
+        help="records rendered at a time (default: %d)" % CHUNK_SIZE)
+    parser.add_argument(
+        '--cache', metavar='FILE',
+        help="SQLite database of rendered legends, only the legends missing from "
+             "it are rendered")
+    parser.add_argument(
+        '--errors', metavar='FILE',
+        help="lenient mode: records that can not be rendered get empty legends and "
+             "URLs and their index, field and reason are written to FILE as JSON lines")
+
+    return parser
+
+
+def parse_arguments(parser, argv=None):
+    """
+    Parse the command line with the styles and languages defaults, checking
+    the languages before any record is read.
+    """
+
+    args = parser.parse_args(argv)
+
+    if not args.styles and not args.urls:
+        args.styles = ['descriptive']
+
+    args.styles = args.styles or []
+    args.languages = args.languages or ['en']
+
+    for language in args.languages:
+        try:
+            labels(language)
+        except (LanguageNotFound, ValueError) as exc:
+            parser.error(str(exc))
+
+    return args
+
+
+def write_output(rows, args, columns):
+    """
+    Write output dicts to args.output, in args.output_format or else in the
+    format of the inputs.
+    """
+
+    output_format = (
+        args.output_format or args.input_format or input_format_of(args.inputs[0])
+    )
+
+    if args.output == '-':
+        write_rows(rows, sys.stdout, output_format, columns)
+        sys.stdout.flush()
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as stream:
+            write_rows(rows, stream, output_format, columns)
+
+
+def write_errors(errors, path):
+    """
+    Write RecordError tuples to a file as JSON lines.
+    """
+
+    with open(path, 'w', encoding='utf-8') as stream:
+        write_rows([error._asdict() for error in errors], stream, 'jsonl', RecordError._fields)
+
+
+def render_rows(records, args):
+    """
+    Render the output dicts of the records in order, in this process or on a
+    pool of args.jobs processes.
+    """
+
+    arguments = (
+        args.styles, args.languages, args.urls, args.keep, args.cache, bool(args.errors)
+    )
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(args.jobs) as executor:
+            for row in map_chunks(
+                    executor, render_outputs, records, arguments, args.chunk_size,
+                    2 * args.jobs):
+                yield row
+    else:
+        for chunk in chunks(records, args.chunk_size):
+            for row in render_outputs(chunk, *arguments):
+                yield row
+
+
+def split_errors(rows, errors):
+    """
+    Yield output dicts, moving the '_error' items of lenient mode to a list
+    of RecordError indexed by output row.
+    """
+
+    for index, row in enumerate(rows):
+        error = row.pop('_error', None)
+
+        if error is not None:
+            errors.append(RecordError(index, *error))
+
+        yield row
+
+
+def main(argv=None):
+
+    argument_parser = parser()
+    args = parse_arguments(argument_parser, argv)
+    columns = output_columns(args.styles, args.languages, args.urls, args.keep)
+
+    errors = []
+    rows = split_errors(
+        render_rows(open_inputs(args.inputs, args.input_format, bool(args.errors)), args), errors
+    )
+
+    try:
+        write_output(rows, args, columns)
+    except InvalidLine as exc:
+        argument_parser.error(str(exc))
+
+    if args.errors:
+        write_errors(errors, args.errors)
+
+    return 0
@@ -0,0 +1,96 @@
+# coding: utf-8
+"""
+pandas DataFrame accessor for legend generation.
+
+Importing this module (it requires pandas) registers df.legendarium:
+
+    import legendarium.dataframe
+
+    df['legend'] = df.legendarium.descriptive_short(language='pt')
+"""
+import pandas as pd
+
+from legendarium.batch import CitationBatch
+from legendarium.formatter import ARTICLE_FIELDS, STYLES, _check_styles
+
+
+@pd.api.extensions.register_dataframe_accessor('legendarium')
+class LegendariumAccessor(object):
+    """
+    Render the formatter STYLES for the whole frame column-wise, returning a
+    Series aligned to the frame index. Each style is also available as a
+    method, as in df.legendarium.very_short(language='es').
+
+    Column names default to the format functions arguments (title,
+    short_title, pubdate, volume, number, fpage, lpage, elocation, suppl,
+    journal),
+    others can be given with columns={'title': 'journal_title', ...}.
+    Missing columns are empty and missing values (NaN, None) are empty
+    strings. Integer columns with missing values, stored as floats or as
+    the nullable Int64 dtype, render as integers (67, not 67.0).
+    """
+
+    def __init__(self, frame):
+        self._frame = frame
+
+    def batch(self, columns=None):
+        """
+        Return a CitationBatch with the frame citation columns.
+        """
+
+        columns = dict(columns or {})
+        given = {}
+
+        for field in ARTICLE_FIELDS + ('journal',):
+            name = columns.get(field, field)
+
+            if name in self._frame.columns:
+                given[field] = _column_values(self._frame[name])
+
+        return CitationBatch(**given)
+
+    def render(self, style, language='en', columns=None):
+        """
+        Render the frame in one of the formatter STYLES.
+
+        return: (Series) one legend per row, named after the style
+        """
+
+        _check_styles([style])
+
+        legends = self.batch(columns).render(style, language)
+
+        return pd.Series(legends, index=self._frame.index, name=style, dtype=object)
+
+
+def _column_values(series):
+    """
+    Return the values of a column as a list, missing values as empty
+    strings and integral floats as int. The column is converted to objects
+    first, as nullable dtypes such as Int64 do not take '' as a value.
+    """
+
+    values = series.astype(object).where(series.notna(), '').tolist()
+
+    if series.dtype.kind == 'f':
+        values = [
+            int(value) if isinstance(value, float) and value.is_integer() else value
+            for value in values
+        ]
+
+    return values
+
+
+def _style_method(style):
+
+    def render_style(self, language='en', columns=None):
+        return self.render(style, language, columns)
+
+    render_style.__name__ = style
+    render_style.__doc__ = "Render the frame in the %s style." % style
+
+    return render_style
+
+
+for _style in STYLES:
+    setattr(LegendariumAccessor, _style, _style_method(_style))
@@ -1,15 +1,55 @@
 # coding: utf-8
 import re
-import locale
+import calendar
 
-from datetime import datetime
+from functools import lru_cache, wraps
+from inspect import signature
+from itertools import islice
+from operator import attrgetter, itemgetter
 
-from legendarium.utils import translations
+from legendarium.cache import LRUCache, MISSING
+from legendarium.languages import labels
+from legendarium.utils import RECORD_ERRORS, RecordError
 
 NUMBERS = re.compile(r"[^0-9]")
 FORMAT_PREFIX = re.compile(r"%.")
 SPACES = re.compile(r" +")
 
+# YYYY, YYYY-MM, YYYY-MM-DD or YYYYMMDD, full dates may be followed by a time
+PUBDATE_TIME = r"(?:[T ][0-9]{2}:[0-9]{2}[0-9:.,+\-Z]*)?"
+PUBDATE = re.compile(
+    r"([0-9]{4})(?:-([0-9]{1,2})(?:-([0-9]{1,2})" + PUBDATE_TIME + r")?"
+    r"|([0-9]{2})([0-9]{2})" + PUBDATE_TIME + r")?"
+)
+
+PARSE_DATE_CACHE_SIZE = 4096
+
+FORMAT_CACHE_SIZE = 512
+TEMPLATE_CACHE_SIZE = 1024
+RESULT_CACHE_SIZE = 4096
+
+# Opt-in cache of the format functions results, see enable_result_cache
+_result_cache = None
+
+# Placeholders whose value depends on the citation language
+LANGUAGE_PLACEHOLDERS = ('%D',)
+
+# Placeholder dispatch table, only the placeholders used by a spec are resolved
+FORMAT_RESOLVERS = {
+    '%T': attrgetter('title'),
+    '%t': attrgetter('short_title'),
+    '%Y': attrgetter('yearpubdata'),
+    '%D': attrgetter('descriptive_dmy_date'),
+    '%v': attrgetter('volume'),
+    '%n': attrgetter('number'),
+    '%s': attrgetter('suppl'),
+    '%f': attrgetter('fpage'),
+    '%l': attrgetter('lpage'),
+    '%p': attrgetter('pages'),
+    '%e': attrgetter('elocation'),
+    '%d': attrgetter('pubdate')
+}
+
 
 def get_numbers(value):
     """
@@ -22,26 +62,203 @@ def get_numbers(value):
 
 
 def parse_date(value):
+    """
+    Normalize a publication date to YYYY, YYYY-MM or YYYY-MM-DD.
 
-    try:
-        dt = datetime.strptime(value, '%Y-%m-%d')
-        return dt.isoformat()[:10]
-    except:
-        try:
-            dt = datetime.strptime(value, '%Y-%m')
-            return dt.isoformat()[:7]
-        except:
-            try:
-                dt = datetime.strptime(value, '%Y')
-                return dt.isoformat()[:4]
-            except:
-                raise ValueError(u'Probably not a valid date')
+    Also accepts YYYYMMDD, zeroed month or day (YYYY-00-00, YYYY-MM-00) and a
+    trailing time component, which are discarded.
+    """
+
+    return _parse_date_parts(value)[0]
+
+
+def _parse_date_parts(value):
+    """
+    Return the normalized date with its month and day (0 when absent).
+    """
+    if not isinstance(value, str):
+        raise ValueError(u'Probably not a valid date')
+
+    return _parse_date(value)
+
+
+@lru_cache(maxsize=PARSE_DATE_CACHE_SIZE)
+def _parse_date(value):
+
+    match = PUBDATE.fullmatch(value)
+
+    if not match:
+        raise ValueError(u'Probably not a valid date')
+
+    year, month, day = match.group(1, 2, 3)
+
+    if match.group(4):
+        month, day = match.group(4, 5)
+
+    year = int(year)
+    month = int(month) if month else 0
+    day = int(day) if day and month else 0
+
+    if year < 1 or month > 12 or (day and day > calendar.monthrange(year, month)[1]):
+        raise ValueError(u'Probably not a valid date')
+
+    if day:
+        return '%04d-%02d-%02d' % (year, month, day), month, day
+
+    if month:
+        return '%04d-%02d' % (year, month), month, day
+
+    return '%04d' % year, month, day
+
+
+def descriptive_date(pubdate, month, day, language):
+    """
+    Render a normalized date and its month and day as DD MON YYYY, MON YYYY
+    or YYYY in the given language.
+    """
+
+    if not month:
+        return pubdate[0:4]
+
+    month = labels(language).months[month - 1]
+
+    if day:
+        return '%02d %s %s' % (day, month, pubdate[0:4])
+
+    return '%s %s' % (month, pubdate[0:4])
+
+
+def join_pages(fpage, lpage, elocation):
+    """
+    Return the page range of normalized pages, or the elocation when there
+    are no pages.
+    """
+
+    if fpage and lpage:
+        return fpage + '-' + lpage if fpage <= lpage else lpage + '-' + fpage
+
+    return fpage or lpage or elocation
+
+
+class CompiledFormat(object):
+    """
+    A format spec parsed once into literal and placeholder tokens.
+
+    Use compile_format to get a cached instance instead of building one
+    directly.
+    """
+
+    def __init__(self, fmt_spec, patterns):
+
+        tokens = []
+        placeholders = []
+        position = 0
+
+        for match in FORMAT_PREFIX.finditer(fmt_spec):
+            item = match.group()
+
+            if item not in patterns:
+                raise ValueError('Pattern %s not found in %s' % (item, str(list(patterns))))
+
+            if match.start() > position:
+                tokens.append((fmt_spec[position:match.start()], None))
+
+            tokens.append((None, item))
+
+            if item not in placeholders:
+                placeholders.append(item)
+
+            position = match.end()
+
+        if position < len(fmt_spec):
+            tokens.append((fmt_spec[position:], None))
+
+        self.fmt_spec = fmt_spec
+        self.tokens = tuple(tokens)
+        self.placeholders = tuple(placeholders)
+        self._resolvers = tuple([patterns[item] for item in placeholders])
+
+        # Render plan: the tokens as a str.format template over the placeholders
+        self._plan = ''.join([
+            literal.replace('{', '{{').replace('}', '}}') if item is None
+            else '{%d}' % placeholders.index(item)
+            for literal, item in tokens
+        ])
+
+    def __repr__(self):
+        return "%s.%s(%r)" % (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self.fmt_spec
+        )
+
+    def render(self, citation):
+        """
+        Render the tokens resolving only the placeholders this spec contains.
+        """
+
+        return self._plan.format(
+            *[resolver(citation) for resolver in self._resolvers]
+        ).strip()
+
+    def render_rows(self, columns, rows):
+        """
+        Render the given row indexes from a mapping of placeholder to a column
+        of values.
+        """
+
+        plan = self._plan.format
+        selected = [columns[item] for item in self.placeholders]
+
+        return [plan(*[column[row] for column in selected]).strip() for row in rows]
+
+    def substitute(self, values):
+        """
+        Render the tokens with the given mapping of placeholder to value.
+        """
+
+        return self._plan.format(
+            *[values[item] for item in self.placeholders]
+        ).strip()
+
+    def split(self, item, values):
+        """
+        Render the tokens before and after the first occurrence of item with
+        the given mapping of placeholder to value, without stripping, so that
+        (head + value + tail).strip() is the rendering with item as value.
+
+        return: (tuple) head, tail
+        """
+
+        tokens = self.tokens
+        position = tokens.index((None, item))
+
+        return tuple([
+            ''.join([literal if placeholder is None else values[placeholder]
+                     for literal, placeholder in part])
+            for part in (tokens[:position], tokens[position + 1:])
+        ])
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def compile_format(fmt_spec):
+    """
+    Return the CompiledFormat for the given spec, parsing each spec only once.
+    """
+
+    return CompiledFormat(fmt_spec, FORMAT_RESOLVERS)
 
 
 class CitationFormatter:
 
+    __slots__ = (
+        '_title', '_short_title', '_pubdate', '_volume', '_number',
+        '_suppl', '_fpage', '_lpage', '_elocation', '_language', '_month',
+        '_day'
+    )
+
     def __init__(self, title='', short_title='', pubdate='', volume='', number='',
-                 fpage='', lpage='', elocation='', suppl=''):
+                 fpage='', lpage='', elocation='', suppl='', language='en', journal=None):
 
         """
         Create a instance of Legendarium
@@ -55,17 +272,24 @@ class CitationFormatter:
         volume -- issue volume
         number -- issue number
         suppl -- supplement identification
+        language -- language of the month names in the descriptive date
+        journal -- JournalContext used in place of title and short_title
         """
 
-        self._title = title.strip() if title else ''
-        self._short_title = short_title.strip() if short_title else ''
-        self._pubdate = parse_date(pubdate)
+        if journal is not None:
+            self._title = journal.title
+            self._short_title = journal.short_title
+        else:
+            self._title = title.strip() if title else ''
+            self._short_title = short_title.strip() if short_title else ''
+        self._pubdate, self._month, self._day = _parse_date_parts(pubdate)
         self._volume = str(volume).strip() if volume else ''
         self._number = str(number).strip() if number else ''
         self._suppl = str(suppl).strip() if suppl else ''
         self._fpage = str(fpage).strip() if fpage else ''
         self._lpage = str(lpage).strip() if lpage else ''
         self._elocation = str(elocation).strip() if elocation else ''
+        self._language = language
 
     def __repr__(self):
         return "%s.%s(%s, %s, %s, %s, %s, %s, %s, %s, %s)" % (
@@ -100,18 +324,18 @@ class CitationFormatter:
     @property
     def descriptive_dmy_date(self):
 
-        if len(self._pubdate) == 10:
-            dt = datetime.strptime(self._pubdate, '%Y-%m-%d')
-            dt = dt.strftime('%d %b %Y').upper()
-
-        if len(self._pubdate) == 7:
-            dt = datetime.strptime(self._pubdate, '%Y-%m')
-            dt = dt.strftime('%b %Y').upper()
+        return self.descriptive_date()
 
-        if len(self._pubdate) == 4:
-            dt = self._pubdate
+    def descriptive_date(self, language=None):
+        """
+        Return the publication date as DD MON YYYY, MON YYYY or YYYY, with the
+        month abbreviation taken from the language tables instead of the
+        process locale.
+        """
 
-        return dt
+        return descriptive_date(
+            self._pubdate, self._month, self._day, language or self._language
+        )
 
     @property
     def pubdate(self):
@@ -174,15 +398,7 @@ class CitationFormatter:
     @property
     def pages(self):
 
-        pages = [i for i in sorted([self.fpage, self.lpage]) if i]
-
-        if pages:
-            return "-".join(pages)
-
-        if self.elocation:
-            return self.elocation
-
-        return ''
+        return join_pages(self._fpage, self._lpage, self._elocation)
 
     @property
     def elocation(self):
@@ -208,36 +424,445 @@ class CitationFormatter:
 
     def format(self, fmt_spec=''):
 
-        return self.__format__(fmt_spec)
+        return self.__format__(fmt_spec)
+
+    def __format__(self, fmt_spec=''):
+
+        return compile_format(fmt_spec).render(self)
+
+
+class FrozenCitationFormatter(CitationFormatter):
+    """
+    Immutable CitationFormatter, equal and hashed by its normalized fields
+    and language, so it may be used as a dict key or deduplicated with a
+    set. Each instance memoizes its format(spec) results.
+    """
+
+    __slots__ = ('_formatted', '_key', '_hash')
+
+    def __init__(self, title='', short_title='', pubdate='', volume='', number='',
+                 fpage='', lpage='', elocation='', suppl='', language='en', journal=None):
+
+        CitationFormatter.__init__(
+            self, title, short_title, pubdate, volume, number, fpage, lpage,
+            elocation, suppl, language, journal
+        )
+
+        key = (
+            self._title, self._short_title, self._pubdate, self._volume,
+            self._number, self._fpage, self._lpage, self._elocation,
+            self._suppl, self._language
+        )
+
+        object.__setattr__(self, '_formatted', {})
+        object.__setattr__(self, '_hash', hash(key))
+        # Setting _key last freezes the instance
+        object.__setattr__(self, '_key', key)
+
+    def __setattr__(self, name, value):
+
+        if hasattr(self, '_key'):
+            raise AttributeError(u'%s is immutable' % self.__class__.__qualname__)
+
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+
+        raise AttributeError(u'%s is immutable' % self.__class__.__qualname__)
+
+    def __eq__(self, other):
+
+        if not isinstance(other, FrozenCitationFormatter):
+            return NotImplemented
+
+        return self._key == other._key
+
+    def __ne__(self, other):
+
+        if not isinstance(other, FrozenCitationFormatter):
+            return NotImplemented
+
+        return self._key != other._key
+
+    def __hash__(self):
+
+        return self._hash
+
+    def __reduce__(self):
+
+        # The normalized fields are valid constructor arguments
+        return (self.__class__, self._key)
+
+    def __format__(self, fmt_spec=''):
+
+        try:
+            return self._formatted[fmt_spec]
+        except KeyError:
+            result = self._formatted[fmt_spec] = compile_format(fmt_spec).render(self)
+
+            return result
+
+
+def enable_result_cache(maxsize=RESULT_CACHE_SIZE):
+    """
+    Cache the results of the module level format functions in a LRU cache
+    of at most maxsize legends, shared by all threads. Calls are keyed on
+    the function and its normalized arguments bound in signature order, so
+    positional and keyword calls with the same values, or with ' 67' and
+    '67', share an entry while 67.0 and 67 do not.
+
+    Enabling it again replaces the cache with an empty one.
+    """
+
+    global _result_cache
+
+    _result_cache = LRUCache(maxsize)
+
+
+def disable_result_cache():
+    """
+    Stop caching the format functions results and drop the cache.
+    """
+
+    global _result_cache
+
+    _result_cache = None
+
+
+def clear_result_cache():
+    """
+    Empty the result cache and reset its statistics.
+    """
+
+    if _result_cache is not None:
+        _result_cache.clear()
+
+
+def result_cache_info():
+    """
+    return: (CacheInfo) hits, misses, evictions, maxsize and currsize of the
+    result cache, or None when it is disabled
+    """
+
+    if _result_cache is not None:
+        return _result_cache.info()
+
+
+# Normalized values are text. Values the format functions reject (a title
+# or a date that is not text) are marked with a leading \x01, values that
+# are present but blank with a single space, which normalized text never is.
+
+
+def _normalize_text(value):
+
+    if isinstance(value, str):
+        return value.strip()
+
+    return '\x01%r' % (value,) if value else ''
+
+
+def _normalize_date(value):
+
+    return value if isinstance(value, str) else '\x01%r' % (value,)
+
+
+def _normalize(value):
+
+    return (str(value).strip() or ' ') if value else ''
+
+
+def _normalize_suppl(value):
+
+    normalized = _normalize(value)
+
+    # Only a '0' as given is an unnumbered supplement
+    if normalized == '0' and value != '0':
+        return ' 0'
+
+    return normalized
+
+
+def _keep(value):
+
+    return value
+
+
+def _call(function, value):
+
+    return function(value)
+
+
+# Field -> function normalizing its value, see normalized_values
+FIELD_NORMALIZERS = {
+    'title': _normalize_text,
+    'short_title': _normalize_text,
+    'pubdate': _normalize_date,
+    'suppl': _normalize_suppl,
+    'language': _keep,
+    'journal': _keep,
+}
+
+
+def normalized_values(fields, values):
+    """
+    Return a tuple of field values normalized as the format functions read
+    them, so that values rendering the same legend (' 67' and '67') are
+    equal and values rendering different ones (67.0 and 67) are not.
+    """
+
+    return tuple([
+        FIELD_NORMALIZERS.get(field, _normalize)(value) for field, value in zip(fields, values)
+    ])
+
+
+def result_cached(function):
+    """
+    Decorate a format function to use the result cache when it is enabled.
+    Calls are keyed on their normalized arguments, see normalized_values.
+    """
+
+    parameters = list(signature(function).parameters.values())
+    index = dict([(parameter.name, i) for i, parameter in enumerate(parameters)])
+    defaults = [parameter.default for parameter in parameters]
+    normalizers = [
+        FIELD_NORMALIZERS.get(parameter.name, _normalize) for parameter in parameters
+    ]
+
+    # Fields come before the language and journal, and text fields that are
+    # already stripped are their own normalized value
+    fields = normalizers.index(_keep) if _keep in normalizers else len(normalizers)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+
+        cache = _result_cache
+
+        if cache is None or len(args) > len(defaults):
+            return function(*args, **kwargs)
+
+        values = list(args) + defaults[len(args):]
+
+        for name, value in kwargs.items():
+            if name not in index:
+                return function(*args, **kwargs)
+
+            values[index[name]] = value
+
+        text = values[:fields]
+
+        try:
+            normalized = list(map(str.strip, text)) == text
+        except TypeError:
+            normalized = False
+
+        if not normalized:
+            values = list(map(_call, normalizers, values))
+
+        key = (function.__name__,) + tuple(values)
+
+        try:
+            result = cache.get(key, MISSING)
+        except TypeError:
+            # Unhashable arguments are never cached
+            return function(*args, **kwargs)
+
+        if result is MISSING:
+            result = function(*args, **kwargs)
+            cache.set(key, result)
+
+        return result
+
+    return wrapper
+
+
+# Templates only depend on the language and on which fields are present, so
+# each combination is built and compiled once.
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _very_short_template(language, volume, number, suppl):
+
+    template = ['%Y,']
+
+    vn = ''
+    if volume:
+        vn += '%v'
+
+    if number:
+        vn += '(%n)'
+
+    template.append(vn)
+
+    if suppl:
+        template.append(labels(language).suppl+'. %s')
+
+    return compile_format(' '.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _short_template(volume, number, suppl):
+
+    template = ['%t, %Y']
+
+    vn = ''
+    if volume:
+        vn += '%v'
+
+    if number:
+        vn += '(%n)'
+
+    template.append(vn)
+
+    if suppl:
+        template.append('suppl %s')
+
+    return compile_format(' '.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _descriptive_template(language, volume, number, suppl, suppl_zero, pages, elocation):
+
+    template = ['%T']
+
+    if volume:
+        template.append(labels(language).volume+': %v')
+
+    if number:
+        template.append(labels(language).issue+': %n')
+
+    if suppl:
+        if suppl_zero:
+            template[-1] += ' '+labels(language).supplement
+        else:
+            template[-1] += ' '+labels(language).supplement+' %s'
+
+    if pages:
+        template.append(labels(language).pages+': %p')
+
+    if elocation:
+        if pages:
+            template.pop()
+        template.append(labels(language).article_number+': %e')
+
+    template.append(labels(language).published+': %D')
+
+    return compile_format(', '.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _descriptive_html_template(language, volume, number, suppl, pages, elocation):
+
+    template = []
+    template.append('<div class="biblio_label">')
+    template.append('<span class="title">%T</span>')
+
+    if volume:
+        template.append('<span class="prefix volume">'+labels(language).volume+':</span> <span class="value volume">%v</span>')
+
+    if number:
+        template.append('<span class="prefix number">'+labels(language).issue+':</span> <span class="value number">%n</span>')
+
+    if suppl:
+        template.append('<span class="prefix supplement">'+labels(language).supplement+'</span> <span class="value supplement">%s</span>')
+
+    if pages:
+        template.append('<span class="prefix pages">'+labels(language).pages+':</span> <span class="value pages">%p</span>')
+
+    if elocation:
+        if pages:
+            template.pop()
+        template.append('<span class="prefix pages">'+labels(language).article_number+':</span> <span class="value pages">%e</span>')
+
+    template.append('<span class="prefix published">'+labels(language).published+':</span> <span class="value published">%D</span>')
+    template.append('</div>')
+
+    return compile_format(''.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _descriptive_short_template(language, volume, number, suppl, suppl_zero):
+
+    template = ['%T']
+
+    if volume:
+        template.append(labels(language).volume+': %v')
+
+    if number:
+        template.append(labels(language).issue+': %n')
+
+    if suppl:
+        if suppl_zero:
+            template[-1] += ' '+labels(language).supplement
+        else:
+            template[-1] += ' '+labels(language).supplement+' %s'
+
+    template.append(labels(language).published+': %D')
+
+    return compile_format(', '.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _descriptive_html_short_template(language, volume, number, suppl):
+
+    template = []
+    template.append('<div class="biblio_label">')
+    template.append('<span class="title">%T</span>')
+
+    if volume:
+        template.append('<span class="prefix volume">'+labels(language).volume+':</span> <span class="value volume">%v</span>')
+
+    if number:
+        template.append('<span class="prefix number">'+labels(language).issue+':</span> <span class="value number">%n</span>')
+
+    if suppl:
+        template.append('<span class="prefix supplement">'+labels(language).supplement+'</span> <span class="value supplement">%s</span>')
+    template.append('<span class="prefix published">'+labels(language).published+':</span> <span class="value published">%D</span>')
+    template.append('</div>')
+
+    return compile_format(''.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _descriptive_very_short_template(language, volume, number, suppl, suppl_zero):
+
+    template = ['%Y']
+
+    if volume:
+        template.append(labels(language).volume+': %v')
+
+    if number:
+        template.append(labels(language).issue+': %n')
+
+    if suppl:
+        if suppl_zero:
+            template[-1] += ' '+labels(language).supplement
+        else:
+            template[-1] += ' '+labels(language).supplement+' %s'
+
+    return compile_format(', '.join(template))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _descriptive_html_very_short_template(language, volume, number, suppl):
+
+    template = []
+    template.append('<div class="biblio_label">')
+    template.append('<span class="year">%Y</span>')
+    if volume:
+        template.append('<span class="prefix volume">'+labels(language).volume+':</span> <span class="value volume">%v</span>')
+
+    if number:
+        template.append('<span class="prefix number">'+labels(language).issue+':</span> <span class="value number">%n</span>')
 
-    def __format__(self, fmt_spec=''):
+    if suppl:
+        template.append('<span class="prefix supplement">'+labels(language).supplement+'</span> <span class="value supplement">%s</span>')
 
-        FORMAT_PATTERNS = {
-            '%T': self.title,
-            '%t': self.short_title,
-            '%Y': self.yearpubdata,
-            '%D': self.descriptive_dmy_date,
-            '%v': self.volume,
-            '%n': self.number,
-            '%s': self.suppl,
-            '%f': self.fpage,
-            '%l': self.lpage,
-            '%p': self.pages,
-            '%e': self.elocation,
-            '%d': self.pubdate
-        }
-
-        itens = FORMAT_PREFIX.findall(fmt_spec)
-
-        for item in itens:
-            if item in FORMAT_PATTERNS:
-                fmt_spec = fmt_spec.replace(item, FORMAT_PATTERNS[item])
-            else:
-                raise ValueError('Pattern %s not found in %s' % [item, str([i for i in FORMAT_PATTERNS])])
+    template.append('</div>')
 
-        return fmt_spec.strip()
+    return compile_format(''.join(template))
 
 
+@result_cached
 def very_short_format(pubdate='', volume='', number='', suppl='', language='en'):
     """
     Return a very short version of a bibliografic legend, according to the given
@@ -255,19 +880,7 @@ def very_short_format(pubdate='', volume='', number='', suppl='', language='en')
     67(9) suppl. 3 - 2011
     """
 
-    template = ['%Y,']
-
-    vn = ''
-    if volume:
-        vn += '%v'
-
-    if number:
-        vn += '(%n)'
-
-    template.append(vn)
-
-    if suppl:
-        template.append(translations['suppl'][language]+'. %s')
+    template = _very_short_template(language, bool(volume), bool(number), bool(suppl))
 
     output = CitationFormatter(
         title='',
@@ -281,10 +894,11 @@ def very_short_format(pubdate='', volume='', number='', suppl='', language='en')
         suppl=suppl
     )
 
-    return output.format(' '.join(template))
+    return template.render(output)
 
 
-def short_format(title='', short_title='', pubdate='', volume='', number='', suppl=''):
+@result_cached
+def short_format(title='', short_title='', pubdate='', volume='', number='', suppl='', journal=None):
     """
     Return a short version of a bibliografic legend, according to the given
     parameters.
@@ -296,23 +910,12 @@ def short_format(title='', short_title='', pubdate='', volume='', number='', sup
     volume -- issue volume
     number -- issue number
     suppl -- supplement identification
+    journal -- JournalContext used in place of title and short_title
 
     return (string) Rev.Mal-Estar Subj, 2011 67(9) suppl. 3
     """
 
-    template = ['%t, %Y']
-
-    vn = ''
-    if volume:
-        vn += '%v'
-
-    if number:
-        vn += '(%n)'
-
-    template.append(vn)
-
-    if suppl:
-        template.append('suppl %s')
+    template = _short_template(bool(volume), bool(number), bool(suppl))
 
     output = CitationFormatter(
         title=title,
@@ -323,13 +926,15 @@ def short_format(title='', short_title='', pubdate='', volume='', number='', sup
         fpage='',
         lpage='',
         elocation='',
-        suppl=suppl
+        suppl=suppl,
+        journal=journal
     )
 
-    return output.format(' '.join(template))
+    return template.render(output)
 
 
-def descriptive_format(title='', short_title='', pubdate='', volume='', number='', fpage='', lpage='', elocation='', suppl='', language='en'):
+@result_cached
+def descriptive_format(title='', short_title='', pubdate='', volume='', number='', fpage='', lpage='', elocation='', suppl='', language='en', journal=None):
     """
     Return a short version of a bibliografic legend, according to the given
     parameters.
@@ -341,34 +946,16 @@ def descriptive_format(title='', short_title='', pubdate='', volume='', number='
     volume -- issue volume
     number -- issue number
     suppl -- supplement identification
+    journal -- JournalContext used in place of title and short_title
 
     return: (string)
     Revista Mal-Estar Subjetivo, 2011, volume: 67, number: 9, supplement: 3, pages: 154-200
     """
 
-    template = ['%T']
-
-    if volume:
-        template.append(translations['volume'][language]+': %v')
-
-    if number:
-        template.append(translations['issue'][language]+': %n')
-
-    if suppl:
-        if suppl == '0':
-            template[-1] += ' '+translations['supplement'][language]
-        else:
-            template[-1] += ' '+translations['supplement'][language]+' %s'
-
-    if fpage or lpage:
-        template.append(translations['pages'][language]+': %p')
-
-    if elocation:
-        if (fpage or lpage):
-            template.pop()
-        template.append(translations['article number'][language]+': %e')
-
-    template.append(translations['published'][language]+': %D')
+    template = _descriptive_template(
+        language, bool(volume), bool(number), bool(suppl), suppl == '0',
+        bool(fpage or lpage), bool(elocation)
+    )
 
     output = CitationFormatter(
         title=title,
@@ -379,13 +966,16 @@ def descriptive_format(title='', short_title='', pubdate='', volume='', number='
         fpage=fpage,
         lpage=lpage,
         elocation=elocation,
-        suppl=suppl
+        suppl=suppl,
+        language=language,
+        journal=journal
     )
 
-    return output.format(', '.join(template))
+    return template.render(output)
 
 
-def descriptive_html_format(title='', short_title='', pubdate='', volume='', number='', fpage='', lpage='', elocation='', suppl='', language='en'):
+@result_cached
+def descriptive_html_format(title='', short_title='', pubdate='', volume='', number='', fpage='', lpage='', elocation='', suppl='', language='en', journal=None):
     """
     Return a short version of a bibliografic legend, according to the given
     parameters.
@@ -400,6 +990,7 @@ def descriptive_html_format(title='', short_title='', pubdate='', volume='', num
     fpage -- document first page
     lpage -- document last page
     elocation -- document elocation id
+    journal -- JournalContext used in place of title and short_title
 
     return:
     <div class="biblio_label">
@@ -416,29 +1007,10 @@ def descriptive_html_format(title='', short_title='', pubdate='', volume='', num
     </div>
     """
 
-    template = []
-    template.append('<div class="biblio_label">')
-    template.append('<span class="title">%T</span>')
-
-    if volume:
-        template.append('<span class="prefix volume">'+translations['volume'][language]+':</span> <span class="value volume">%v</span>')
-
-    if number:
-        template.append('<span class="prefix number">'+translations['issue'][language]+':</span> <span class="value number">%n</span>')
-
-    if suppl:
-        template.append('<span class="prefix supplement">'+translations['supplement'][language]+'</span> <span class="value supplement">%s</span>')
-
-    if fpage or lpage:
-        template.append('<span class="prefix pages">'+translations['pages'][language]+':</span> <span class="value pages">%p</span>')
-
-    if elocation:
-        if (fpage or lpage):
-            template.pop()
-        template.append('<span class="prefix pages">'+translations['article number'][language]+':</span> <span class="value pages">%e</span>')
-
-    template.append('<span class="prefix published">'+translations['published'][language]+':</span> <span class="value published">%D</span>')
-    template.append('</div>')
+    template = _descriptive_html_template(
+        language, bool(volume), bool(number), bool(suppl),
+        bool(fpage or lpage), bool(elocation)
+    )
 
     output = CitationFormatter(
         title=title,
@@ -449,13 +1021,16 @@ def descriptive_html_format(title='', short_title='', pubdate='', volume='', num
         fpage=fpage,
         lpage=lpage,
         elocation=elocation,
-        suppl=suppl
+        suppl=suppl,
+        language=language,
+        journal=journal
     )
 
-    return output.format(''.join(template))
+    return template.render(output)
 
 
-def descriptive_short_format(title='', short_title='', pubdate='', volume='', number='', suppl='', language='en'):
+@result_cached
+def descriptive_short_format(title='', short_title='', pubdate='', volume='', number='', suppl='', language='en', journal=None):
     """
     Return a short version of a bibliografic legend, according to the given
     parameters.
@@ -467,26 +1042,15 @@ def descriptive_short_format(title='', short_title='', pubdate='', volume='', nu
     volume -- issue volume
     number -- issue number
     suppl -- supplement identification
+    journal -- JournalContext used in place of title and short_title
 
     return: (string)
     Revista Mal-Estar Subjetivo, 2011, Volume: 67, Number: 9, Supplement: 3
     """
 
-    template = ['%T']
-
-    if volume:
-        template.append(translations['volume'][language]+': %v')
-
-    if number:
-        template.append(translations['issue'][language]+': %n')
-
-    if suppl:
-        if suppl == '0':
-            template[-1] += ' '+translations['supplement'][language]
-        else:
-            template[-1] += ' '+translations['supplement'][language]+' %s'
-
-    template.append(translations['published'][language]+': %D')
+    template = _descriptive_short_template(
+        language, bool(volume), bool(number), bool(suppl), suppl == '0'
+    )
 
     output = CitationFormatter(
         title=title,
@@ -497,13 +1061,16 @@ def descriptive_short_format(title='', short_title='', pubdate='', volume='', nu
         fpage='',
         lpage='',
         elocation='',
-        suppl=suppl
+        suppl=suppl,
+        language=language,
+        journal=journal
     )
 
-    return output.format(', '.join(template))
+    return template.render(output)
 
 
-def descriptive_html_short_format(title='', short_title='', pubdate='', volume='', number='', suppl='', language='en'):
+@result_cached
+def descriptive_html_short_format(title='', short_title='', pubdate='', volume='', number='', suppl='', language='en', journal=None):
     """
     Return a short version of a bibliografic legend, according to the given
     parameters.
@@ -515,6 +1082,7 @@ def descriptive_html_short_format(title='', short_title='', pubdate='', volume='
     volume -- issue volume
     number -- issue number
     suppl -- supplement identification
+    journal -- JournalContext used in place of title and short_title
 
     return:
     <div class="biblio_label">
@@ -529,20 +1097,9 @@ def descriptive_html_short_format(title='', short_title='', pubdate='', volume='
     </div>
     """
 
-    template = []
-    template.append('<div class="biblio_label">')
-    template.append('<span class="title">%T</span>')
-
-    if volume:
-        template.append('<span class="prefix volume">'+translations['volume'][language]+':</span> <span class="value volume">%v</span>')
-
-    if number:
-        template.append('<span class="prefix number">'+translations['issue'][language]+':</span> <span class="value number">%n</span>')
-
-    if suppl:
-        template.append('<span class="prefix supplement">'+translations['supplement'][language]+'</span> <span class="value supplement">%s</span>')
-    template.append('<span class="prefix published">'+translations['published'][language]+':</span> <span class="value published">%D</span>')
-    template.append('</div>')
+    template = _descriptive_html_short_template(
+        language, bool(volume), bool(number), bool(suppl)
+    )
 
     output = CitationFormatter(
         title=title,
@@ -553,12 +1110,15 @@ def descriptive_html_short_format(title='', short_title='', pubdate='', volume='
         fpage='',
         lpage='',
         elocation='',
-        suppl=suppl
+        suppl=suppl,
+        language=language,
+        journal=journal
     )
 
-    return output.format(''.join(template))
+    return template.render(output)
 
 
+@result_cached
 def descriptive_very_short_format(pubdate='', volume='', number='', suppl='', language='en'):
     """
     Return a short version of a bibliografic legend, according to the given
@@ -576,19 +1136,9 @@ def descriptive_very_short_format(pubdate='', volume='', number='', suppl='', la
     2011, Volume: 67, Number: 9, Supplement: 3
     """
 
-    template = ['%Y']
-
-    if volume:
-        template.append(translations['volume'][language]+': %v')
-
-    if number:
-        template.append(translations['issue'][language]+': %n')
-
-    if suppl:
-        if suppl == '0':
-            template[-1] += ' '+translations['supplement'][language]
-        else:
-            template[-1] += ' '+translations['supplement'][language]+' %s'
+    template = _descriptive_very_short_template(
+        language, bool(volume), bool(number), bool(suppl), suppl == '0'
+    )
 
     output = CitationFormatter(
         title='',
@@ -602,9 +1152,10 @@ def descriptive_very_short_format(pubdate='', volume='', number='', suppl='', la
         suppl=suppl
     )
 
-    return output.format(', '.join(template))
+    return template.render(output)
 
 
+@result_cached
 def descriptive_html_very_short_format(pubdate='', volume='', number='', suppl='', language='en'):
     """
     Return a short version of a bibliografic legend, according to the given
@@ -631,19 +1182,9 @@ def descriptive_html_very_short_format(pubdate='', volume='', number='', suppl='
     </div>
     """
 
-    template = []
-    template.append('<div class="biblio_label">')
-    template.append('<span class="year">%Y</span>')
-    if volume:
-        template.append('<span class="prefix volume">'+translations['volume'][language]+':</span> <span class="value volume">%v</span>')
-
-    if number:
-        template.append('<span class="prefix number">'+translations['issue'][language]+':</span> <span class="value number">%n</span>')
-
-    if suppl:
-        template.append('<span class="prefix supplement">'+translations['supplement'][language]+'</span> <span class="value supplement">%s</span>')
-
-    template.append('</div>')
+    template = _descriptive_html_very_short_template(
+        language, bool(volume), bool(number), bool(suppl)
+    )
 
     output = CitationFormatter(
         title='',
@@ -657,4 +1198,414 @@ def descriptive_html_very_short_format(pubdate='', volume='', number='', suppl='
         suppl=suppl
     )
 
-    return output.format(''.join(template))
+    return template.render(output)
+
+
+ISSUE_FIELDS = ('pubdate', 'volume', 'number', 'suppl')
+JOURNAL_ISSUE_FIELDS = ('title', 'short_title', 'pubdate', 'volume', 'number', 'suppl')
+ARTICLE_FIELDS = (
+    'title', 'short_title', 'pubdate', 'volume', 'number', 'fpage', 'lpage',
+    'elocation', 'suppl'
+)
+
+# Keyword arguments of format_styles and format_languages besides the options
+RECORD_FIELDS = ARTICLE_FIELDS + ('journal',)
+
+# Style name -> (format function, positional fields, accepts language)
+STYLES = {
+    'very_short': (very_short_format, ISSUE_FIELDS, True),
+    'short': (short_format, JOURNAL_ISSUE_FIELDS, False),
+    'descriptive': (descriptive_format, ARTICLE_FIELDS, True),
+    'descriptive_html': (descriptive_html_format, ARTICLE_FIELDS, True),
+    'descriptive_short': (descriptive_short_format, JOURNAL_ISSUE_FIELDS, True),
+    'descriptive_html_short': (descriptive_html_short_format, JOURNAL_ISSUE_FIELDS, True),
+    'descriptive_very_short': (descriptive_very_short_format, ISSUE_FIELDS, True),
+    'descriptive_html_very_short': (descriptive_html_very_short_format, ISSUE_FIELDS, True),
+}
+
+
+# Styles whose format function takes a JournalContext in place of the titles
+JOURNAL_STYLES = frozenset([
+    style for style, (function, fields, translated) in STYLES.items()
+    if 'journal' in signature(function).parameters
+])
+
+
+def _style_fields(style):
+    """
+    Return the fields format_many reads for a style, its positional fields
+    followed by journal when the style takes one.
+    """
+
+    fields = STYLES[style][1]
+
+    return fields + ('journal',) if style in JOURNAL_STYLES else fields
+
+
+def _template_flags(volume, number, suppl, fpage, lpage, elocation):
+    """
+    Return the presence flags the style templates depend on: volume, number,
+    suppl, suppl == '0', pages and elocation.
+    """
+
+    return (
+        bool(volume), bool(number), bool(suppl), suppl == '0',
+        bool(fpage or lpage), bool(elocation)
+    )
+
+
+# Style name -> function choosing the style template from the presence flags
+STYLE_TEMPLATES = {
+    'very_short': lambda language, f: _very_short_template(language, f[0], f[1], f[2]),
+    'short': lambda language, f: _short_template(f[0], f[1], f[2]),
+    'descriptive': lambda language, f: _descriptive_template(language, *f),
+    'descriptive_html': lambda language, f: _descriptive_html_template(
+        language, f[0], f[1], f[2], f[4], f[5]),
+    'descriptive_short': lambda language, f: _descriptive_short_template(language, *f[:4]),
+    'descriptive_html_short': lambda language, f: _descriptive_html_short_template(
+        language, f[0], f[1], f[2]),
+    'descriptive_very_short': lambda language, f: _descriptive_very_short_template(
+        language, *f[:4]),
+    'descriptive_html_very_short': lambda language, f: _descriptive_html_very_short_template(
+        language, f[0], f[1], f[2]),
+}
+
+
+def _check_styles(styles):
+
+    unknown = [style for style in styles if style not in STYLES]
+
+    if unknown:
+        raise ValueError('Style %s not found in %s' % (unknown[0], str(sorted(STYLES))))
+
+
+def _format_record(fields, styles, languages):
+    """
+    Render one record in each style and language, sharing the normalized
+    fields, the presence flags and every placeholder value that does not
+    depend on the language.
+    """
+
+    styles = list(STYLES) if styles is None else styles
+    _check_styles(styles)
+
+    for name in fields:
+        if name not in RECORD_FIELDS:
+            raise TypeError(u"unexpected keyword argument '%s'" % name)
+
+    record = dict([(field, fields.get(field, '')) for field in ARTICLE_FIELDS])
+
+    output = CitationFormatter(journal=fields.get('journal'), **record)
+
+    flags = _template_flags(
+        record['volume'], record['number'], record['suppl'], record['fpage'],
+        record['lpage'], record['elocation']
+    )
+
+    values = {}
+    result = {}
+
+    for language in languages:
+        rendered = result[language] = {}
+
+        for item in LANGUAGE_PLACEHOLDERS:
+            values.pop(item, None)
+
+        for style in styles:
+            template = STYLE_TEMPLATES[style](language, flags)
+
+            for item in template.placeholders:
+                if item not in values:
+                    if item == '%D':
+                        values[item] = output.descriptive_date(language)
+                    else:
+                        values[item] = FORMAT_RESOLVERS[item](output)
+
+            rendered[style] = template.substitute(values)
+
+    return result
+
+
+def format_styles(styles=None, language='en', **fields):
+    """
+    Render one record in several styles at once, normalizing the fields and
+    parsing the publication date only once.
+
+    Keyword arguments:
+    styles -- names from STYLES, all of them by default
+    language -- language of the labels
+    fields -- the format functions arguments (title, short_title, pubdate,
+              volume, number, fpage, lpage, elocation, suppl, journal)
+
+    return: (dict) style name -> legend, the same as each format function
+    """
+
+    return _format_record(fields, styles, [language])[language]
+
+
+def format_languages(styles=None, languages=('pt', 'es', 'en'), **fields):
+    """
+    Render one record in several styles and languages at once. Only the
+    labels and the month names change between languages, everything else
+    is computed once.
+
+    Keyword arguments:
+    styles -- names from STYLES, all of them by default
+    languages -- languages of the labels
+    fields -- the format functions arguments (title, short_title, pubdate,
+              volume, number, fpage, lpage, elocation, suppl, journal)
+
+    return: (dict) language -> style name -> legend
+    """
+
+    return _format_record(fields, styles, languages)
+
+
+def _same_types(values, other):
+    """
+    Tell whether two tuples of field values have the same types. Equal text
+    values always render the same legend, equal values of other types may
+    not (67.0 and 67).
+    """
+
+    for value, other_value in zip(values, other):
+        if value.__class__ is not other_value.__class__:
+            return False
+
+    return True
+
+
+def _record_values(records, fields, lenient=False):
+    """
+    Yield the tuple of field values of each dict or tuple record. A last
+    journal field is only read from dicts, tuple records get None.
+
+    Keyword arguments:
+    lenient -- yield the error of a record that is neither a dict nor an
+               iterable instead of raising it
+    """
+
+    journal = fields[-1] == 'journal'
+    positional = fields[:-1] if journal else fields
+    getter = itemgetter(*positional)
+
+    for record in records:
+        try:
+            if isinstance(record, dict):
+                try:
+                    values = getter(record)
+                except KeyError:
+                    values = tuple([record.get(field, '') for field in positional])
+
+                if journal:
+                    values += (record.get('journal'),)
+            else:
+                values = tuple(record)
+
+                if journal:
+                    values += ('',) * (len(positional) - len(values)) + (None,)
+        except RECORD_ERRORS as exc:
+            if not lenient:
+                raise
+
+            values = exc
+
+        yield values
+
+
+def _invalid_field(fields, values):
+    """
+    Return the field of a record that does not validate, None when the
+    error does not come from a single field.
+    """
+
+    record = dict(zip(fields, values))
+
+    try:
+        _parse_date_parts(record.get('pubdate', ''))
+    except ValueError:
+        return 'pubdate'
+
+    for field in ('title', 'short_title'):
+        if record.get(field) and not isinstance(record[field], str):
+            return field
+
+    if record.get('journal') is not None and not hasattr(record['journal'], 'short_title'):
+        return 'journal'
+
+
+def _record_error(index, fields, values, render):
+    """
+    Return the RecordError of a record that failed to render.
+    """
+
+    try:
+        render(values)
+    except RECORD_ERRORS as exc:
+        return RecordError(index, _invalid_field(fields, values), str(exc))
+
+
+def format_many(records, style, language='en', store=None, errors=None):
+    """
+    Render an iterable of records with one of the STYLES, yielding the
+    legends in the same order.
+
+    Records may be dicts with the style function arguments (other keys are
+    ignored) or tuples with those arguments in positional order, as listed
+    in STYLES. Dicts may carry a JournalContext as journal for the styles
+    with a title. Templates and parsed dates are shared across the records and
+    a record equal to the previous one reuses its legend, which is the
+    common case for issue level styles over a dump sorted by issue.
+
+    Keyword arguments:
+    store -- a legendarium.store.LegendStore; records are then looked up in
+             bulk, store.batch_size at a time, and only the missing legends
+             are rendered and written back
+    errors -- a list to run in lenient mode: a record that can not be
+              rendered yields None and appends a RecordError(index, field,
+              reason) instead of raising
+
+    Example:
+        format_many([{'pubdate': '2011', 'volume': '67'}], 'very_short')
+        yields '2011, 67'
+    """
+
+    _check_styles([style])
+
+    if store is not None:
+        return _format_stored(records, style, language, store, errors)
+
+    if errors is not None:
+        return _format_lenient(records, style, language, errors)
+
+    return _format_many(records, style, language)
+
+
+def _style_renderer(style, language):
+    """
+    Return the function rendering a tuple of field values, as read for
+    _style_fields, in a style. The language and the journal are keywords,
+    so a short tuple can not fill a field with them.
+    """
+
+    function, fields, translated = STYLES[style]
+    options = {'language': language} if translated else {}
+
+    def render(values):
+        return function(*values, **options)
+
+    def render_journal(values):
+        return function(*values[:-1], journal=values[-1], **options)
+
+    return render_journal if style in JOURNAL_STYLES else render
+
+
+def _format_many(records, style, language):
+
+    fields = _style_fields(style)
+    render = _style_renderer(style, language)
+
+    previous = output = text = None
+
+    for values in _record_values(records, fields):
+        if values == previous:
+            if text is None:
+                text = all([value.__class__ is str for value in previous])
+
+            if text or _same_types(values, previous):
+                yield output
+                continue
+
+        output = render(values)
+        previous = values
+        text = None
+
+        yield output
+
+
+def _format_lenient(records, style, language, errors):
+
+    fields = _style_fields(style)
+    render = _style_renderer(style, language)
+
+    previous = output = error = text = None
+
+    for index, values in enumerate(_record_values(records, fields, True)):
+        if isinstance(values, Exception):
+            errors.append(RecordError(index, None, str(values)))
+            previous = None
+            yield None
+            continue
+
+        if values == previous:
+            if text is None:
+                text = all([value.__class__ is str for value in previous])
+
+            same = text or _same_types(values, previous)
+        else:
+            same = False
+
+        if not same:
+            previous = values
+            text = error = None
+
+            try:
+                output = render(values)
+            except RECORD_ERRORS as exc:
+                output = None
+                error = RecordError(index, _invalid_field(fields, values), str(exc))
+
+        if error is not None:
+            errors.append(error._replace(index=index))
+
+        yield output
+
+
+def _format_stored(records, style, language, store, errors=None):
+
+    fields = _style_fields(style)
+    render = _style_renderer(style, language)
+
+    if errors is not None:
+        strict = render
+
+        def render(values):
+
+            # Failed records are not stored and are rendered again below
+            # to report their error
+            try:
+                return strict(values)
+            except RECORD_ERRORS:
+                return None
+
+    values = _record_values(records, fields, errors is not None)
+    offset = 0
+
+    while True:
+        rows = list(islice(values, store.batch_size))
+
+        if not rows:
+            break
+
+        if errors is None:
+            for legend in store.render(style, language, rows, render, fields):
+                yield legend
+        else:
+            # Records that could not be read skip the store
+            valid = [row for row in rows if not isinstance(row, Exception)]
+            legends = iter(store.render(style, language, valid, render, fields))
+
+            for position, row in enumerate(rows):
+                if isinstance(row, Exception):
+                    errors.append(RecordError(offset + position, None, str(row)))
+                    yield None
+                    continue
+
+                legend = next(legends)
+
+                if legend is None:
+                    errors.append(_record_error(offset + position, fields, row, strict))
+
+                yield legend
+
+        offset += len(rows)
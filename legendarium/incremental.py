@@ -0,0 +1,310 @@
+# coding: utf-8
+"""
+Incremental renderer: compares a dump of records with the manifest of the
+previous run and renders only the new and changed records, writing the
+delta of their legends and URLs.
+
+    python -m legendarium.incremental --manifest manifest.tsv \\
+        -s descriptive -l pt -u url_article --id-field pid articles.jsonl > delta.jsonl
+
+The manifest has a line per record with its JSON id, its fingerprint and its
+JSON outputs separated by tabs, and is rewritten at the end of each run.
+Unchanged entries are copied as they are, without decoding their outputs,
+so a run mostly costs reading the dump and the manifest. Delta rows have the
+same columns as the command line output plus "op" (added, changed or
+removed) and the record id; changed rows only carry the columns whose value
+changed and removed rows carry the previous outputs. With --errors, records
+that can not be rendered keep their previous manifest entry, so they are
+retried on the next run, and are reported by id instead of index.
+"""
+import hashlib
+import json
+import os
+
+from collections import namedtuple
+
+from legendarium import __version__
+from legendarium.cli import (
+    InvalidLine,
+    open_inputs,
+    output_columns,
+    parse_arguments,
+    parser as cli_parser,
+    render_outputs,
+    render_rows,
+    write_errors,
+    write_output
+)
+from legendarium.formatter import ARTICLE_FIELDS
+from legendarium.parallel import CHUNK_SIZE, chunks
+from legendarium.urlegendarium import URL_FIELDS
+from legendarium.utils import RecordError
+
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+
+Change = namedtuple('Change', 'op id outputs')
+
+
+def read_manifest(path):
+    """
+    Read a manifest file, an empty manifest when it does not exist.
+
+    return: (dict) record id -> (fingerprint, outputs as JSON text)
+    """
+
+    manifest = {}
+
+    if not os.path.exists(path):
+        return manifest
+
+    with open(path, encoding='utf-8') as stream:
+        for line in stream:
+            if line.strip():
+                record_id, fingerprint, outputs = line.rstrip('\n').split('\t', 2)
+                manifest[json.loads(record_id)] = (fingerprint, outputs)
+
+    return manifest
+
+
+def write_manifest(manifest, path):
+    """
+    Write a manifest file, replacing the previous one only once it is
+    complete.
+    """
+
+    temporary = path + '.tmp'
+
+    with open(temporary, 'w', encoding='utf-8') as stream:
+        for record_id, (fingerprint, outputs) in manifest.items():
+            stream.write('%s\t%s\t%s\n' % (
+                json.dumps(record_id, ensure_ascii=False), fingerprint, outputs
+            ))
+
+    os.replace(temporary, path)
+
+
+class IncrementalRender(object):
+    """
+    Render the delta between a previous manifest and a new dump of records.
+
+    A record fingerprint hashes the library version, the rendering options
+    and the record fields they read, so unchanged records are skipped
+    without rendering, while another version or other options re-render
+    everything.
+
+    run = IncrementalRender(read_manifest(path), ['descriptive'], ['pt'])
+    for change in run.delta(records):
+        ...
+    write_manifest(run.manifest, path)
+    """
+
+    def __init__(self, manifest, styles=(), languages=('en',), urls=(), keep=(),
+                 id_field='pid', lenient=False):
+
+        """
+        arguments:
+        manifest -- the previous run manifest, see read_manifest
+
+        Keyword arguments:
+        styles -- legend styles, from the formatter STYLES
+        languages -- legend languages
+        urls -- URLegendarium URL styles
+        keep -- input columns copied to the outputs
+        id_field -- input column identifying the records
+        lenient -- render in lenient mode, see delta
+        """
+
+        self.previous = manifest
+        self.manifest = {}
+        self.counts = dict.fromkeys((ADDED, CHANGED, REMOVED, 'unchanged', 'failed'), 0)
+        self.errors = []
+
+        self.styles = list(styles)
+        self.languages = list(languages)
+        self.urls = list(urls)
+        self.keep = [name for name in keep if name != id_field]
+        self.id_field = id_field
+        self.lenient = lenient
+
+        self._fields = list(dict.fromkeys(
+            self.keep +
+            (list(ARTICLE_FIELDS) if self.styles else []) +
+            (list(URL_FIELDS) if self.urls else [])
+        ))
+        self._prefix = hashlib.blake2b(
+            '\x00'.join([__version__] + [
+                ','.join(option) for option in (self.styles, self.languages, self.urls, self.keep)
+            ]).encode('utf-8'),
+            digest_size=16
+        )
+        self._pending = {}
+
+    def fingerprint(self, record):
+        """
+        Return the fingerprint of the fields of a record dict the outputs
+        depend on.
+        """
+
+        digest = self._prefix.copy()
+        digest.update('\x00'.join([
+            str(value) if value else '' for value in map(record.get, self._fields)
+        ]).encode('utf-8'))
+
+        # Only records with a journal hash it, the others keep their fingerprint
+        journal = record.get('journal')
+
+        if journal:
+            digest.update(('\x00journal\x00%s' % (journal,)).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def changed_records(self, records):
+        """
+        Yield the records that are new or whose fingerprint changed, keeping
+        the manifest entries of the others.
+        """
+
+        for record in records:
+            record_id = record.get(self.id_field)
+
+            if record_id in (None, ''):
+                raise ValueError(u'Record without %s' % self.id_field)
+
+            if record_id in self.manifest or record_id in self._pending:
+                raise ValueError(u'Duplicated %s %s' % (self.id_field, record_id))
+
+            fingerprint = self.fingerprint(record)
+            previous = self.previous.get(record_id)
+
+            if previous is not None and previous[0] == fingerprint:
+                self.manifest[record_id] = previous
+                self.counts['unchanged'] += 1
+            else:
+                self._pending[record_id] = fingerprint
+                yield record
+
+    def render(self, records, chunk_size=CHUNK_SIZE):
+        """
+        Render the output dicts of records in this process, with the id
+        column first. Give delta another function to render elsewhere.
+        """
+
+        for chunk in chunks(records, chunk_size):
+            for row in render_outputs(
+                    chunk, self.styles, self.languages, self.urls,
+                    [self.id_field] + self.keep, lenient=self.lenient):
+                yield row
+
+    def delta(self, records, render=None):
+        """
+        Yield a Change(op, id, outputs) per added, changed or removed record,
+        removed ones last, and fill self.manifest with the new manifest.
+
+        Keyword arguments:
+        render -- function rendering an iterable of records into output
+                  dicts in order, including the id column, self.render by
+                  default
+
+        Rows of lenient mode with an '_error' item add a RecordError, indexed
+        by record id, to self.errors and keep the previous manifest entry.
+        """
+
+        rows = (render or self.render)(self.changed_records(records))
+
+        for row in rows:
+            record_id = row.pop(self.id_field)
+            fingerprint = self._pending.pop(record_id)
+            previous = self.previous.get(record_id)
+            error = row.pop('_error', None)
+
+            if error is not None:
+                self.counts['failed'] += 1
+                self.errors.append(RecordError(record_id, *error))
+
+                if previous is not None:
+                    self.manifest[record_id] = previous
+                continue
+
+            self.manifest[record_id] = (fingerprint, json.dumps(row, ensure_ascii=False))
+
+            if previous is None:
+                self.counts[ADDED] += 1
+                yield Change(ADDED, record_id, row)
+                continue
+
+            outputs = json.loads(previous[1])
+            changed = dict([
+                (name, value) for name, value in row.items() if outputs.get(name) != value
+            ])
+
+            if changed:
+                self.counts[CHANGED] += 1
+                yield Change(CHANGED, record_id, changed)
+            else:
+                self.counts['unchanged'] += 1
+
+        for record_id, (fingerprint, outputs) in self.previous.items():
+            if record_id not in self.manifest:
+                self.counts[REMOVED] += 1
+                yield Change(REMOVED, record_id, json.loads(outputs))
+
+
+def parser():
+
+    parser = cli_parser()
+    parser.prog = 'python -m legendarium.incremental'
+    parser.description = (
+        "Render the legends and URLs of the records added or changed since the "
+        "previous run and write the delta."
+    )
+    parser.add_argument(
+        '--manifest', required=True, metavar='FILE',
+        help="manifest of the previous run, created when missing and rewritten at the end")
+    parser.add_argument(
+        '--id-field', default='pid', metavar='COLUMN',
+        help="input column identifying the records (default: pid)")
+
+    return parser
+
+
+def main(argv=None):
+
+    argument_parser = parser()
+    args = parse_arguments(argument_parser, argv)
+
+    run = IncrementalRender(
+        read_manifest(args.manifest), args.styles, args.languages, args.urls, args.keep,
+        args.id_field, bool(args.errors)
+    )
+
+    # Rendered rows must carry the id to be matched with the manifest
+    args.keep = [args.id_field] + run.keep
+
+    columns = ['op'] + output_columns(args.styles, args.languages, args.urls, args.keep)
+
+    changes = run.delta(
+        open_inputs(args.inputs, args.input_format),
+        lambda records: render_rows(records, args)
+    )
+    rows = (
+        dict([('op', change.op), (args.id_field, change.id)], **change.outputs)
+        for change in changes
+    )
+
+    try:
+        write_output(rows, args, columns)
+    except InvalidLine as exc:
+        argument_parser.error(str(exc))
+
+    write_manifest(run.manifest, args.manifest)
+
+    if args.errors:
+        write_errors(run.errors, args.errors)
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# coding: utf-8
+from legendarium.formatter import (
+    FORMAT_RESOLVERS,
+    STYLE_TEMPLATES,
+    CitationFormatter,
+    _template_flags,
+    join_pages
+)
+
+# Styles whose legends only differ by the pages between the articles of an issue
+ISSUE_STYLES = ('descriptive', 'descriptive_html')
+
+
+class IssueLegend(object):
+    """
+    The descriptive legends of the articles of one issue.
+
+    The issue part of a legend (title, volume, number, supplement and date)
+    is rendered once per style, language and kind of page field, then each
+    article only splices its pages or elocation in. The output is the same
+    as descriptive_format and descriptive_html_format.
+
+    legend = IssueLegend(title, short_title, pubdate, volume, number)
+    for article in articles:
+        legend.article(article['fpage'], article['lpage'], article['elocation'])
+    """
+
+    __slots__ = ('_citation', '_flags', '_language', '_fragments')
+
+    def __init__(self, title='', short_title='', pubdate='', volume='', number='',
+                 suppl='', language='en', journal=None):
+
+        """
+        Keyword arguments:
+        title -- Full version of the journal title
+        short_title -- short version of the journal title
+        pubdate -- a valid ISO date YYYY-MM-DD
+        volume -- issue volume
+        number -- issue number
+        suppl -- supplement identification
+        language -- default language of the article legends
+        journal -- JournalContext used in place of title and short_title
+        """
+
+        self._citation = CitationFormatter(
+            title=title,
+            short_title=short_title,
+            pubdate=pubdate,
+            volume=volume,
+            number=number,
+            suppl=suppl,
+            journal=journal
+        )
+        self._flags = _template_flags(volume, number, suppl, '', '', '')[:4]
+        self._language = language
+        self._fragments = {}
+
+    def __repr__(self):
+        return "%s.%s(%s)" % (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self._citation.rawformat
+        )
+
+    def _fragment(self, style, language, pages, elocation):
+        """
+        Render the issue part of a style template around its page field.
+
+        return: (tuple) head, page placeholder or None, tail
+        """
+
+        if style not in ISSUE_STYLES:
+            raise ValueError('Style %s not found in %s' % (style, str(list(ISSUE_STYLES))))
+
+        template = STYLE_TEMPLATES[style](language, self._flags + (pages, elocation))
+        citation = self._citation
+
+        values = dict([
+            (item, FORMAT_RESOLVERS[item](citation)) for item in template.placeholders
+        ])
+        values['%D'] = citation.descriptive_date(language)
+
+        item = '%e' if elocation else '%p' if pages else None
+
+        if item is None:
+            fragment = (template.substitute(values), None, '')
+        else:
+            head, tail = template.split(item, values)
+            fragment = (head, item, tail)
+
+        self._fragments[(style, language, pages, elocation)] = fragment
+
+        return fragment
+
+    def article(self, fpage='', lpage='', elocation='', style='descriptive', language=None):
+        """
+        Return the legend of an article of the issue in one of the
+        ISSUE_STYLES, in the issue language unless another one is given.
+        """
+
+        key = (style, language or self._language, bool(fpage or lpage), bool(elocation))
+
+        try:
+            head, item, tail = self._fragments[key]
+        except KeyError:
+            head, item, tail = self._fragment(*key)
+
+        if item is None:
+            return head
+
+        if item == '%e':
+            value = str(elocation).strip()
+        else:
+            value = join_pages(
+                str(fpage).strip() if fpage else '',
+                str(lpage).strip() if lpage else '',
+                ''
+            )
+
+        return (head + value + tail).strip()
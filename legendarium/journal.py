@@ -0,0 +1,61 @@
+# coding: utf-8
+import sys
+
+from weakref import WeakValueDictionary
+
+
+def _normalize(value):
+
+    return sys.intern(str(value).strip()) if value else ''
+
+
+class JournalContext(object):
+    """
+    The fields every citation of a journal shares: title, short title and
+    acronym, normalized and interned once.
+
+    JournalContext is a flyweight: creating it again with the same
+    normalized fields returns the instance already alive, so a whole
+    collection keeps one copy per journal. Pass it as journal= to
+    CitationFormatter, URLegendarium and the format functions in place of
+    their title, short_title and acron arguments.
+    """
+
+    __slots__ = ('title', 'short_title', 'acronym', '__weakref__')
+
+    _instances = WeakValueDictionary()
+
+    def __new__(cls, title='', short_title='', acronym=''):
+
+        key = (_normalize(title), _normalize(short_title), _normalize(acronym))
+
+        instance = cls._instances.get(key)
+
+        if instance is None:
+            instance = object.__new__(cls)
+            for name, value in zip(('title', 'short_title', 'acronym'), key):
+                object.__setattr__(instance, name, value)
+            instance = cls._instances.setdefault(key, instance)
+
+        return instance
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError(u'%s is immutable' % self.__class__.__qualname__)
+
+    def __delattr__(self, name):
+
+        raise AttributeError(u'%s is immutable' % self.__class__.__qualname__)
+
+    def __reduce__(self):
+
+        return (self.__class__, (self.title, self.short_title, self.acronym))
+
+    def __repr__(self):
+        return "%s.%s(%r, %r, %r)" % (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self.title,
+            self.short_title,
+            self.acronym
+        )
@@ -0,0 +1,151 @@
+# coding: utf-8
+"""
+Language packs: the labels and month abbreviations of each legend language.
+
+pt, es and en come from legendarium.utils; fr, it and de are JSON packs
+shipped in legendarium/locales. Other languages are added with
+register_language from a JSON file, a gettext .mo catalog or a mapping.
+Packs are only read and compiled into a Labels bundle the first time their
+language is rendered.
+"""
+import gettext
+import json
+import os
+
+from collections import namedtuple
+
+from legendarium.utils import months, translations
+
+LOCALES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+
+# Pack keys, as in legendarium.utils.translations
+LABEL_KEYS = (
+    'volume', 'issue', 'pages', 'supplement', 'suppl', 'article number', 'published'
+)
+
+# gettext catalogs translate the English labels and month abbreviations
+MSGIDS = tuple([translations[key]['en'] for key in LABEL_KEYS]) + months['en']
+
+Labels = namedtuple(
+    'Labels',
+    'volume issue pages supplement suppl article_number published months'
+)
+
+
+class LanguageNotFound(KeyError):
+    """
+    Raised for a language without a language pack.
+    """
+
+    def __init__(self, language):
+
+        KeyError.__init__(self, language)
+        self.language = language
+
+    def __str__(self):
+        return u'Language %s not found in %s' % (self.language, str(available_languages()))
+
+
+# Language -> pack source: a path or a mapping, read on first use
+_packs = {}
+
+# Language -> compiled Labels
+_bundles = {}
+
+
+def register_language(language, pack):
+    """
+    Add the pack of a language, or replace it while it was not rendered yet.
+
+    arguments:
+    language -- language code used as the format functions language argument
+    pack -- path of a JSON file ({"volume": ..., "months": [12 names]} with
+            the keys of legendarium.utils.translations) or of a gettext .mo
+            catalog translating the English labels and months, or a mapping
+            like the JSON file
+    """
+
+    if language in _bundles:
+        raise ValueError(u'Language %s is already in use' % language)
+
+    _packs[language] = pack
+
+
+def available_languages():
+    """
+    return: (list) the languages with a pack, registered or shipped
+    """
+
+    shipped = [
+        name[:-len('.json')] for name in os.listdir(LOCALES) if name.endswith('.json')
+    ]
+
+    return sorted(set(list(months) + shipped + list(_packs)))
+
+
+def _read_pack(language):
+
+    pack = _packs.get(language)
+
+    if pack is None:
+        if language in months:
+            pack = dict(
+                [(key, translations[key][language]) for key in LABEL_KEYS],
+                months=months[language]
+            )
+        else:
+            pack = os.path.join(LOCALES, '%s.json' % language)
+
+            if os.path.basename(language) != language or not os.path.exists(pack):
+                raise LanguageNotFound(language)
+
+    if not isinstance(pack, str):
+        return pack
+
+    if pack.endswith('.mo'):
+        with open(pack, 'rb') as stream:
+            catalog = gettext.GNUTranslations(stream)
+
+        labels = [catalog.gettext(msgid) for msgid in MSGIDS]
+
+        return dict(zip(LABEL_KEYS, labels), months=labels[len(LABEL_KEYS):])
+
+    with open(pack, encoding='utf-8') as stream:
+        return json.load(stream)
+
+
+def compile_pack(pack):
+    """
+    Return the Labels of a pack mapping, raising ValueError when it misses
+    labels or does not have 12 months.
+    """
+
+    missing = [key for key in LABEL_KEYS + ('months',) if not pack.get(key)]
+
+    if missing:
+        raise ValueError(u'Language pack without %s' % ', '.join(missing))
+
+    if len(pack['months']) != 12:
+        raise ValueError(u'Language pack months must have 12 names')
+
+    return Labels(*([str(pack[key]) for key in LABEL_KEYS] + [tuple(pack['months'])]))
+
+
+def labels(language):
+    """
+    Return the Labels bundle of a language, compiling its pack on first use.
+
+    Raises LanguageNotFound, a KeyError, for a language without a pack.
+    """
+
+    try:
+        return _bundles[language]
+    except (KeyError, TypeError):
+        pass
+
+    if not isinstance(language, str):
+        raise LanguageNotFound(language)
+
+    bundle = _bundles[language] = compile_pack(_read_pack(language))
+
+    return bundle
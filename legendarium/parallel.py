@@ -0,0 +1,174 @@
+# coding: utf-8
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from legendarium.formatter import _check_styles, format_many
+from legendarium.urlegendarium import URL_STYLES, url_many
+
+CHUNK_SIZE = 1000
+
+
+def check_style(style):
+    """
+    Raise ValueError unless style is one of the formatter STYLES or the
+    URL_STYLES.
+    """
+
+    if style not in URL_STYLES:
+        _check_styles([style])
+
+
+def render(records, style, language='en', errors=None):
+    """
+    Render an iterable of records in one of the formatter STYLES (with
+    format_many) or URL_STYLES (with url_many), in the same order.
+
+    Keyword arguments:
+    errors -- a list to run in lenient mode, see format_many
+    """
+
+    if style in URL_STYLES:
+        return url_many(records, style, errors)
+
+    return format_many(records, style, language, errors=errors)
+
+
+def render_chunk(chunk, style, language='en'):
+    """
+    Render a list of records, this is the unit of work given to the pools.
+    """
+
+    return list(render(chunk, style, language))
+
+
+def render_chunk_lenient(chunk, style, language='en'):
+    """
+    Render a list of records in lenient mode, returning a (result,
+    RecordError or None) pair per record, indexed in the chunk.
+    """
+
+    errors = []
+    results = list(render(chunk, style, language, errors))
+    failed = dict([(error.index, error) for error in errors])
+
+    return [(result, failed.get(index)) for index, result in enumerate(results)]
+
+
+def collect_errors(pairs, errors, start=0):
+    """
+    Yield the results of an iterable of (result, error) pairs, appending the
+    errors to a list with their index in the whole input, the first pair
+    being at start.
+    """
+
+    for index, (result, error) in enumerate(pairs, start):
+        if error is not None:
+            errors.append(error._replace(index=index))
+
+        yield result
+
+
+def chunks(records, chunk_size=CHUNK_SIZE):
+    """
+    Split an iterable of records into lists of at most chunk_size records.
+    """
+
+    records = iter(records)
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+
+        if not chunk:
+            break
+
+        yield chunk
+
+
+def map_chunks(executor, function, records, args=(), chunk_size=CHUNK_SIZE, max_in_flight=2):
+    """
+    Apply function(chunk, *args) to the records chunk by chunk on an
+    executor, yielding the items of the returned lists in the input order.
+    At most max_in_flight chunks are submitted and not yet consumed, which
+    bounds the memory whatever the size of the input.
+    """
+
+    pending = deque()
+
+    try:
+        for chunk in chunks(records, chunk_size):
+            pending.append(executor.submit(function, chunk, *args))
+
+            if len(pending) >= max_in_flight:
+                for result in pending.popleft().result():
+                    yield result
+
+        while pending:
+            for result in pending.popleft().result():
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _map_render(executor, records, style, language, chunk_size, max_in_flight, errors):
+
+    if errors is None:
+        return map_chunks(
+            executor, render_chunk, records, (style, language), chunk_size, max_in_flight)
+
+    return collect_errors(map_chunks(
+        executor, render_chunk_lenient, records, (style, language), chunk_size,
+        max_in_flight), errors)
+
+
+def render_parallel(records, style, language='en', workers=None, chunk_size=CHUNK_SIZE,
+                    max_in_flight=None, errors=None):
+    """
+    Render an iterable of records in one of the formatter STYLES or
+    URL_STYLES on a pool of processes, yielding the results in the input
+    order.
+
+    Keyword arguments:
+    workers -- number of processes, os.cpu_count() by default
+    chunk_size -- records sent to a process at a time
+    max_in_flight -- chunks submitted ahead of the consumer, 2 * workers by
+                     default
+    errors -- a list to run in lenient mode, see format_many
+    """
+
+    check_style(style)
+
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(workers) as executor:
+        for result in _map_render(
+                executor, records, style, language, chunk_size,
+                max_in_flight or 2 * workers, errors):
+            yield result
+
+
+def render_threaded(records, style, language='en', workers=None, chunk_size=CHUNK_SIZE,
+                    max_in_flight=None, errors=None):
+    """
+    Render an iterable of records in one of the formatter STYLES or
+    URL_STYLES on a pool of threads, yielding the results in the input
+    order. Same arguments as render_parallel.
+
+    Rendering is thread-safe, see the Thread safety section of the usage
+    documentation for the shared state. Threads scale on free-threaded
+    CPython builds; with the GIL they only help when the consumer or the
+    producer of the records waits on I/O.
+    """
+
+    check_style(style)
+
+    workers = workers or os.cpu_count()
+
+    with ThreadPoolExecutor(workers) as executor:
+        for result in _map_render(
+                executor, records, style, language, chunk_size,
+                max_in_flight or 2 * workers, errors):
+            yield result
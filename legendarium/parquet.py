@@ -0,0 +1,107 @@
+# coding: utf-8
+"""
+Arrow/Parquet writer for rendered legends, it requires pyarrow.
+
+    from legendarium.parquet import write_parquet
+
+    write_parquet(records, 'legends.parquet', styles=['descriptive'],
+                  languages=['pt', 'es', 'en'], keep=['pid'])
+"""
+import os
+
+from itertools import islice
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from legendarium.batch import CitationBatch
+from legendarium.formatter import _check_styles
+
+BATCH_SIZE = 10000
+
+
+def legend_schema(styles, languages, keep=()):
+    """
+    Return the schema with the kept columns followed by one string column
+    per style and language, named STYLE_LANGUAGE.
+    """
+
+    return pa.schema(
+        [pa.field(name, pa.string()) for name in keep] +
+        [
+            pa.field('%s_%s' % (style, language), pa.string())
+            for style in styles for language in languages
+        ]
+    )
+
+
+def legend_batches(records, styles, languages=('en',), keep=(), batch_size=BATCH_SIZE):
+    """
+    Render an iterable of record dicts into Arrow record batches of at most
+    batch_size rows, so only one batch of legends is held at a time.
+
+    Keyword arguments:
+    styles -- names from the formatter STYLES
+    languages -- languages of the labels
+    keep -- record keys copied as string columns, such as an identifier
+    batch_size -- rows per record batch
+    """
+
+    _check_styles(styles)
+
+    schema = legend_schema(styles, languages, keep)
+    records = iter(records)
+
+    while True:
+        chunk = list(islice(records, batch_size))
+
+        if not chunk:
+            break
+
+        batch = CitationBatch.from_records(chunk)
+
+        arrays = [
+            pa.array(
+                [None if record.get(name) is None else str(record[name]) for record in chunk],
+                type=pa.string()
+            )
+            for name in keep
+        ]
+        arrays.extend([
+            pa.array(batch.render(style, language), type=pa.string())
+            for style in styles for language in languages
+        ])
+
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(records, path, styles, languages=('en',), keep=(), batch_size=BATCH_SIZE,
+                  **options):
+    """
+    Stream record dicts into a Parquet file with one column per style and
+    language (see legend_schema), writing a row group per record batch.
+    The file replaces path only once it is complete: a record that fails
+    to render leaves no file behind.
+
+    Extra keyword arguments are given to pyarrow.parquet.ParquetWriter.
+
+    return: (int) number of rows written
+    """
+
+    schema = legend_schema(styles, languages, keep)
+    temporary = path + '.tmp'
+    rows = 0
+
+    try:
+        with pq.ParquetWriter(temporary, schema, **options) as writer:
+            for batch in legend_batches(records, styles, languages, keep, batch_size):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+    os.replace(temporary, path)
+
+    return rows
@@ -0,0 +1,182 @@
+# coding: utf-8
+"""
+Local HTTP rendering service, built on the standard library only.
+
+    python -m legendarium.server --port 8000
+
+GET /styles
+    {"styles": [...], "urls": [...]}
+
+GET /format/STYLE?pubdate=2011&volume=67&language=pt
+    {"legend": "..."}, fields as in the format functions
+
+GET /url/STYLE?acron=spm&year_pub=2011&volume=67
+    {"url": "..."}, fields as in URLegendarium
+
+The GET queries take the journal fields (title, short_title, acron) only,
+not a journal object.
+
+POST /batch
+    {"records": [{...}, ...], "styles": [...], "languages": [...],
+     "urls": [...], "keep": [...], "errors": true}
+    {"results": [{...}, ...], "errors": [{...}, ...]}, one dict per record
+    with the same columns as the command line renderer; with "errors" a
+    failing record gets only the kept columns and an {"index", "field",
+    "reason"} error instead of failing the request
+
+Errors are answered with status 400 and {"error": "..."}. Connections are
+kept alive (HTTP/1.1) and every request runs in its own thread.
+"""
+import argparse
+import json
+import socket
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from legendarium.cli import render_outputs, split_errors
+from legendarium.formatter import STYLES, format_many
+from legendarium.urlegendarium import URL_STYLES, url_many
+from legendarium.utils import RECORD_ERRORS
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+
+class LegendHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'legendarium'
+
+    def setup(self):
+
+        BaseHTTPRequestHandler.setup(self)
+
+        # Headers and body are separate writes, do not let Nagle delay them
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def send_json(self, status, data):
+
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        query = dict(parse_qsl(url.query))
+
+        try:
+            if 'journal' in query:
+                raise ValueError('journal is not a query field, give title, short_title or acron')
+
+            if parts == ['styles']:
+                self.send_json(200, {'styles': sorted(STYLES), 'urls': list(URL_STYLES)})
+            elif len(parts) == 2 and parts[0] == 'format':
+                language = query.pop('language', 'en')
+                legend = next(format_many([query], parts[1], language))
+                self.send_json(200, {'legend': legend})
+            elif len(parts) == 2 and parts[0] == 'url':
+                self.send_json(200, {'url': next(url_many([query], parts[1]))})
+            else:
+                self.send_json(404, {'error': 'Not found: %s' % url.path})
+        except (KeyError,) + RECORD_ERRORS as exc:
+            self.send_json(400, {'error': str(exc)})
+
+    def do_POST(self):
+
+        if urlsplit(self.path).path.strip('/') != 'batch':
+            self.send_json(404, {'error': 'Not found: %s' % self.path})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+
+        if length < 0:
+            # The body can not be skipped without its length
+            self.close_connection = True
+            self.send_json(400, {'error': 'Invalid Content-Length'})
+            return
+
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self.send_json(413, {'error': 'Request body too large'})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            urls = request.get('urls', [])
+            styles = request.get('styles', [] if urls else ['descriptive'])
+
+            for style in urls:
+                if style not in URL_STYLES:
+                    raise ValueError('Style %s not found in %s' % (style, str(list(URL_STYLES))))
+
+            lenient = bool(request.get('errors'))
+            results = render_outputs(
+                request['records'], styles, request.get('languages', ['en']), urls,
+                request.get('keep', []), lenient=lenient
+            )
+        except (KeyError,) + RECORD_ERRORS as exc:
+            self.send_json(400, {'error': str(exc)})
+            return
+
+        if lenient:
+            errors = []
+            results = list(split_errors(results, errors))
+            self.send_json(200, {
+                'results': results, 'errors': [error._asdict() for error in errors]
+            })
+        else:
+            self.send_json(200, {'results': results})
+
+    def log_message(self, format, *args):
+
+        if not self.server.quiet:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+def make_server(host='127.0.0.1', port=8000, quiet=False):
+    """
+    Return a threading HTTP server bound to host and port (0 for any free
+    port) answering with LegendHandler.
+    """
+
+    server = ThreadingHTTPServer((host, port), LegendHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+
+    return server
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog='python -m legendarium.server',
+        description="Serve legendarium legends and URLs over HTTP."
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="default: 127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000, help="default: 8000")
+    parser.add_argument('--quiet', action='store_true', help="do not log the requests")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.quiet)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
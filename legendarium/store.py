@@ -0,0 +1,209 @@
+# coding: utf-8
+"""
+Persistent cache of rendered legends on a SQLite database.
+
+    with LegendStore('legends.db') as store:
+        for legend in format_many(records, 'descriptive', 'pt', store=store):
+            ...
+
+Legends are keyed by a hash of the library version, the style, the language
+and the field values, so the entries of another version are never read and
+are dropped when the database is opened by a new version.
+"""
+import hashlib
+import sqlite3
+
+from threading import Lock
+
+from legendarium import __version__
+from legendarium.formatter import normalized_values
+
+# Keys looked up per SELECT, below the SQLite host parameter limit
+LOOKUP_SIZE = 900
+
+BATCH_SIZE = 5000
+
+KEY_SIZE = 16
+
+
+def _key_value(fields, index, value):
+
+    name = fields[index] if index < len(fields) else ''
+    value = normalized_values((name,), (value,))[0]
+
+    return value if isinstance(value, str) else '\x01%r' % (value,)
+
+
+class LegendStore(object):
+    """
+    A SQLite database of rendered legends, safe to share between threads and
+    between processes opening the same file.
+
+    hits counts the legends that did not need rendering and misses the
+    rendered ones.
+    """
+
+    def __init__(self, path, version=__version__, batch_size=BATCH_SIZE):
+
+        """
+        arguments:
+        path -- database file, created when missing (':memory:' for tests)
+
+        Keyword arguments:
+        version -- version the legends are rendered with, the library one by
+                   default
+        batch_size -- records looked up and written back at a time
+        """
+
+        self.path = path
+        self.version = version
+        self.batch_size = batch_size
+        self.hits = self.misses = 0
+
+        self._lock = Lock()
+        self._prefix = hashlib.blake2b(
+            ('%s\x00' % version).encode('utf-8'), digest_size=KEY_SIZE
+        )
+        self._connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+
+        with self._lock, self._connection as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS legends '
+                '(key BLOB PRIMARY KEY, legend TEXT NOT NULL)'
+            )
+
+            stored = connection.execute(
+                "SELECT value FROM meta WHERE name = 'version'"
+            ).fetchone()
+
+            if stored is None or stored[0] != version:
+                # Legends of another version are unreachable, drop them
+                connection.execute('DELETE FROM legends')
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)",
+                    (version,)
+                )
+
+    def __repr__(self):
+        return "%s.%s(%r, version=%r)" % (
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            self.path,
+            self.version
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM legends').fetchone()[0]
+
+    def close(self):
+
+        with self._lock:
+            self._connection.close()
+
+    def key(self, style, language, values, fields=()):
+        """
+        Return the key of the legend of a tuple of field values.
+
+        Values are keyed normalized as the format functions read them, see
+        formatter.normalized_values, so 67, '67' and ' 67' share a key while
+        67.0 does not. fields names the values, those without a name are
+        normalized as the issue fields. Values are separated by NUL
+        characters, which they must not contain.
+        """
+
+        # Stripped text is its own normalized value, and None (an absent
+        # journal) renders as ''
+        digest = self._prefix.copy()
+        digest.update(
+            '\x00'.join([style, language] + [
+                value if value.__class__ is str and value.strip() == value
+                else '' if value is None else _key_value(fields, index, value)
+                for index, value in enumerate(values)
+            ]).encode('utf-8')
+        )
+
+        return digest.digest()
+
+    def get_many(self, keys):
+        """
+        return: (dict) key -> legend, for the stored keys only
+        """
+
+        keys = list(keys)
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_SIZE):
+                selected = keys[start:start + LOOKUP_SIZE]
+                found.update(self._connection.execute(
+                    'SELECT key, legend FROM legends WHERE key IN (%s)' % (
+                        ', '.join('?' * len(selected))
+                    ),
+                    selected
+                ))
+
+        return found
+
+    def set_many(self, items):
+        """
+        Store (key, legend) pairs in a single transaction.
+        """
+
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO legends (key, legend) VALUES (?, ?)', items
+            )
+
+    def clear(self):
+
+        with self._lock, self._connection as connection:
+            connection.execute('DELETE FROM legends')
+            self.hits = self.misses = 0
+
+    def render(self, style, language, rows, function, fields=()):
+        """
+        Return the legends of a list of field value tuples, reading the stored
+        ones in bulk and rendering the others with function(values), which
+        are then written back in one transaction. Legends rendered as None
+        are returned but not stored.
+
+        Keyword arguments:
+        fields -- names of the values, see key
+        """
+
+        keys = [self.key(style, language, values, fields) for values in rows]
+        found = self.get_many(set(keys))
+        rendered = {}
+        legends = []
+
+        for key, values in zip(keys, rows):
+            legend = found.get(key)
+
+            if legend is None:
+                legend = rendered.get(key)
+
+                if legend is None:
+                    legend = rendered[key] = function(values)
+
+            legends.append(legend)
+
+        with self._lock:
+            self.hits += len(keys) - len(rendered)
+            self.misses += len(rendered)
+
+        if rendered:
+            self.set_many([(key, legend) for key, legend in rendered.items() if legend is not None])
+
+        return legends
@@ -2,14 +2,33 @@
 
 import re
 
+from operator import itemgetter
+
+from legendarium.utils import RECORD_ERRORS, RecordError
+
+URL_FIELDS = (
+    'acron', 'year_pub', 'volume', 'number', 'fpage', 'fpage_sequence', 'lpage',
+    'article_id', 'suppl_number', 'doi', 'order'
+)
+
+URL_STYLES = ('url_journal', 'url_issue', 'url_article')
+
 
 class URLegendarium(object):
 
+    __slots__ = (
+        'acron', 'year_pub', 'volume', 'number', 'suppl_number', 'fpage',
+        'fpage_sequence', 'lpage', 'article_id', 'doi', 'order'
+    )
+
     def __init__(self, acron='', year_pub='', volume='', number='',
                  fpage='', fpage_sequence='', lpage='', article_id='',
-                 suppl_number='', doi='', order=''):
+                 suppl_number='', doi='', order='', journal=None):
 
-        self.acron = str(acron).strip() if acron else ''
+        if journal is not None:
+            self.acron = journal.acronym
+        else:
+            self.acron = str(acron).strip() if acron else ''
         self.year_pub = str(year_pub).strip() if year_pub else ''
         self.volume = str(volume).strip() if volume else ''
         self.number = str(number).strip() if number else ''
@@ -85,6 +104,19 @@ class URLegendarium(object):
         else:
             return ''
 
+    def invalid_field(self):
+        """
+        Return the first field that prevents building the URLs, None when
+        there is none or when the error does not come from a single field.
+        """
+        if not self.acron:
+            return 'acron'
+
+        try:
+            self._clean_year_pub()
+        except ValueError:
+            return 'year_pub'
+
     def get_journal_seg(self):
         """
         Method to build the journal URL.
@@ -184,3 +216,58 @@ class URLegendarium(object):
         args = [self.get_journal_seg(), self.get_issue_seg(), self.get_article_seg()]
 
         return u'{0}/{1}/{2}'.format(*args)
+
+
+def url_many(records, style='url_article', errors=None):
+    """
+    Build the URL of one of the URL_STYLES for an iterable of records,
+    yielding them in the same order.
+
+    Records may be dicts with the URLegendarium arguments, journal included
+    (other keys are ignored), or tuples with those arguments in the
+    URL_FIELDS order.
+
+    Keyword arguments:
+    errors -- a list to run in lenient mode: a record that can not be built
+              yields None and appends a RecordError(index, field, reason)
+              instead of raising
+    """
+
+    if style not in URL_STYLES:
+        raise ValueError('Style %s not found in %s' % (style, str(list(URL_STYLES))))
+
+    getter = itemgetter(*URL_FIELDS)
+
+    for index, record in enumerate(records):
+        if errors is None:
+            yield getattr(_record_url(record, getter), style)
+            continue
+
+        url = None
+
+        try:
+            url = _record_url(record, getter)
+            value = getattr(url, style)
+        except RECORD_ERRORS as exc:
+            errors.append(RecordError(
+                index, url.invalid_field() if url is not None else None, str(exc)
+            ))
+            value = None
+
+        yield value
+
+
+def _record_url(record, getter):
+    """
+    Return the URLegendarium of a dict or tuple record.
+    """
+
+    if isinstance(record, dict):
+        try:
+            values = getter(record)
+        except KeyError:
+            values = [record.get(field, '') for field in URL_FIELDS]
+
+        return URLegendarium(*values, journal=record.get('journal'))
+
+    return URLegendarium(*record)
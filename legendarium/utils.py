@@ -1,4 +1,12 @@
 # coding: utf-8
+from collections import namedtuple
+
+# A record that could not be rendered in lenient mode: its position in the
+# input, the invalid field (None when unknown) and the error message
+RecordError = namedtuple('RecordError', 'index field reason')
+
+# Errors of a single record, collected instead of raised in lenient mode
+RECORD_ERRORS = (ValueError, TypeError, AttributeError)
 
 translations = {
     "volume": {
@@ -37,3 +45,12 @@ translations = {
         "en": "Published"
     }
 }
+
+months = {
+    "pt": ("JAN", "FEV", "MAR", "ABR", "MAI", "JUN",
+           "JUL", "AGO", "SET", "OUT", "NOV", "DEZ"),
+    "es": ("ENE", "FEB", "MAR", "ABR", "MAY", "JUN",
+           "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"),
+    "en": ("JAN", "FEB", "MAR", "APR", "MAY", "JUN",
+           "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+}
@@ -10,6 +10,11 @@ requirements = [
     # TODO: put package requirements here
 ]
 
+extras_requirements = {
+    'pandas': ['pandas'],
+    'parquet': ['pyarrow'],
+}
+
 test_requirements = [
     # TODO: put package test requirements here
 ]
@@ -27,7 +32,12 @@ setup(
         exclude=["*.tests", "*.tests.*", "tests.*", "tests", "docs"]
     ),
     include_package_data=True,
+    entry_points={
+        'console_scripts': ['legendarium=legendarium.cli:main'],
+    },
     install_requires=requirements,
+    extras_require=extras_requirements,
+    python_requires='>=3.7',
     license="BSD license",
     zip_safe=False,
     keywords='legendarium',
@@ -36,8 +46,14 @@ setup(
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
         'Natural Language :: English',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
     test_suite='tests',
     tests_require=test_requirements
@@ -0,0 +1,25 @@
+# coding: utf-8
+"""
+Sample records shared by the batch rendering tests.
+"""
+
+
+def records(count):
+    """
+    Return count article dicts, five per issue, with the fields of the format
+    functions and of URLegendarium.
+    """
+
+    return [
+        {
+            'acron': 'spm',
+            'title': u'Revista Mal-Estar Subjetivo',
+            'pubdate': u'%d-%02d' % (2000 + i // 5, i % 12 + 1),
+            'year_pub': u'%d' % (2000 + i // 5),
+            'volume': str(i // 5),
+            'number': str(i % 5 + 1),
+            'fpage': str(i * 10 + 1),
+            'lpage': str(i * 10 + 9)
+        }
+        for i in range(count)
+    ]
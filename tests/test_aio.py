@@ -0,0 +1,62 @@
+# coding: utf-8
+import asyncio
+import unittest
+
+from legendarium.aio import aformat_many
+from legendarium.formatter import format_many
+from tests.sample import records
+
+
+async def produce(data):
+
+    for record in data:
+        await asyncio.sleep(0)
+        yield record
+
+
+async def collect(iterator):
+
+    return [item async for item in iterator]
+
+
+class TestAformatMany(unittest.TestCase):
+
+    def test_async_iterable(self):
+
+        data = records(45)
+
+        result = asyncio.run(collect(
+            aformat_many(produce(data), 'descriptive', 'pt', slice_size=4, concurrency=3)
+        ))
+
+        self.assertEqual(list(format_many(data, 'descriptive', 'pt')), result)
+
+    def test_plain_iterable(self):
+
+        data = records(10)
+
+        result = asyncio.run(collect(aformat_many(data, 'very_short', slice_size=3)))
+
+        self.assertEqual(list(format_many(data, 'very_short')), result)
+
+    def test_lenient(self):
+
+        data = records(10)
+        data[5]['pubdate'] = '2011-13'
+        errors = []
+
+        result = asyncio.run(collect(
+            aformat_many(produce(data), 'very_short', slice_size=2, errors=errors)
+        ))
+
+        self.assertEqual(list(format_many(data, 'very_short', errors=[])), result)
+        self.assertEqual([(5, 'pubdate')], [error[:2] for error in errors])
+
+    def test_unknown_style(self):
+
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(aformat_many(records(1), 'long')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# coding: utf-8
+import unittest
+
+from legendarium.batch import CitationBatch
+from legendarium.formatter import STYLES, format_many
+
+
+class TestCitationBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {
+                'title': u'Revista Mal-Estar Subjetivo',
+                'short_title': u'Rev.Mal-Estar Subj',
+                'pubdate': u'2011-12-31',
+                'volume': u'67',
+                'number': u'9',
+                'fpage': u'154',
+                'lpage': u'200',
+                'elocation': u'e00120416',
+                'suppl': u'3'
+            },
+            {
+                'title': u'Revista Mal-Estar Subjetivo ',
+                'short_title': u'Rev.Mal-Estar Subj',
+                'pubdate': u'2011-12',
+                'volume': u'67',
+                'number': u'',
+                'fpage': u'154',
+                'lpage': u'',
+                'elocation': u'',
+                'suppl': u'0'
+            },
+            {
+                'title': u'Revista Mal-Estar Subjetivo',
+                'short_title': u'Rev.Mal-Estar Subj',
+                'pubdate': u'2011',
+                'volume': u'67',
+                'number': u'9',
+                'fpage': u'',
+                'lpage': u'',
+                'elocation': u'',
+                'suppl': u' 0'
+            },
+            {
+                'title': u'Cadernos Pagu',
+                'short_title': u'Cad. Pagu',
+                'pubdate': u'2017',
+                'volume': u'',
+                'number': 50,
+                'fpage': u'',
+                'lpage': u'',
+                'elocation': u'e175002',
+                'suppl': None
+            },
+        ]
+
+    def test_render_matches_format_functions(self):
+
+        batch = CitationBatch.from_records(self.records)
+
+        for style in STYLES:
+            for language in ('pt', 'es', 'en'):
+                self.assertEqual(
+                    list(format_many(self.records, style, language)),
+                    batch.render(style, language),
+                    style
+                )
+
+    def test_columns(self):
+
+        batch = CitationBatch(
+            short_title=['Cad. Pagu', ' Cad. Pagu', 'Cad. Pagu'],
+            pubdate=['2017', '2017', '2018']
+        )
+
+        self.assertEqual(3, len(batch))
+        self.assertEqual(['Cad. Pagu'] * 3, batch.column('short_title'))
+        self.assertEqual(['', '', ''], batch.column('volume'))
+        self.assertEqual(
+            ['Cad. Pagu, 2017', 'Cad. Pagu, 2017', 'Cad. Pagu, 2018'],
+            batch.render('short')
+        )
+
+    def test_string_table_dedupes_values(self):
+
+        batch = CitationBatch(
+            title=['Cadernos Pagu'] * 100,
+            pubdate=['2017'] * 100,
+            volume=['1', '2'] * 50
+        )
+
+        self.assertEqual(['', 'Cadernos Pagu', '2017', '1', '2'], batch.strings)
+
+    def test_equal_values_of_other_types(self):
+
+        batch = CitationBatch(pubdate=['2011'] * 3, volume=[67.0, 67, ' 67 '])
+
+        self.assertEqual(['2011, 67.0', '2011, 67', '2011, 67'], batch.render('very_short'))
+
+    def test_columns_length_mismatch(self):
+
+        with self.assertRaises(ValueError):
+            CitationBatch(title=['Cadernos Pagu'], pubdate=['2017', '2018'])
+
+    def test_invalid_pubdate(self):
+
+        batch = CitationBatch(pubdate=['2017', '2017-13'])
+
+        with self.assertRaises(ValueError):
+            batch.render('very_short')
+
+
+if __name__ == "__main__":
+    unittest.main()
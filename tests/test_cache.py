@@ -0,0 +1,58 @@
+# coding: utf-8
+import unittest
+
+from legendarium.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_and_set(self):
+
+        cache = LRUCache(2)
+        cache.set('a', 1)
+
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual('x', cache.get('b', 'x'))
+
+    def test_evicts_least_recently_used(self):
+
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_info(self):
+
+        cache = LRUCache(1)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        cache.set('b', 2)
+
+        info = cache.info()
+
+        self.assertEqual(
+            (1, 1, 1, 1, 1),
+            (info.hits, info.misses, info.evictions, info.maxsize, info.currsize)
+        )
+
+    def test_clear(self):
+
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual((0, 0, 0, 2, 0), tuple(cache.info()))
+
+    def test_invalid_maxsize(self):
+
+        with self.assertRaises(ValueError):
+            LRUCache(0)
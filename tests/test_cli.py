@@ -0,0 +1,208 @@
+# coding: utf-8
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from unittest import mock
+
+from legendarium.cli import main
+from legendarium.formatter import descriptive_format, very_short_format
+from legendarium.urlegendarium import URLegendarium
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = [
+            {
+                'pid': 'S%04d' % i,
+                'acron': 'spm',
+                'title': u'Revista Mal-Estar Subjetivo',
+                'pubdate': u'2011-12-31',
+                'year_pub': u'2011',
+                'volume': u'67',
+                'number': u'9',
+                'fpage': str(i * 10 + 1),
+                'lpage': str(i * 10 + 9)
+            }
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_cache(self):
+
+        with open(self.path('in.jsonl'), 'w') as stream:
+            for record in self.records:
+                stream.write(json.dumps(record) + '\n')
+
+        arguments = [
+            self.path('in.jsonl'), '-s', 'descriptive', '-s', 'very_short', '-l', 'pt',
+            '-k', 'pid', '--cache', self.path('legends.db')
+        ]
+
+        main(arguments + ['-o', self.path('first.jsonl')])
+        main(arguments + ['-o', self.path('second.jsonl'), '-j', '2', '--chunk-size', '2'])
+        main(arguments[:-2] + ['-o', self.path('uncached.jsonl')])
+
+        outputs = []
+        for name in ('first.jsonl', 'second.jsonl', 'uncached.jsonl'):
+            with open(self.path(name)) as stream:
+                outputs.append([json.loads(line) for line in stream])
+
+        self.assertEqual(outputs[2], outputs[0])
+        self.assertEqual(outputs[2], outputs[1])
+
+    def test_errors(self):
+
+        self.records[2]['pubdate'] = '2011-13'
+        self.records[3]['acron'] = ''
+
+        with open(self.path('in.jsonl'), 'w') as stream:
+            for record in self.records:
+                stream.write(json.dumps(record) + '\n')
+
+        main([
+            self.path('in.jsonl'), '-o', self.path('out.jsonl'), '-s', 'descriptive',
+            '-u', 'url_issue', '-k', 'pid', '--errors', self.path('errors.jsonl'),
+            '-j', '2', '--chunk-size', '2'
+        ])
+
+        with open(self.path('out.jsonl')) as stream:
+            rows = [json.loads(line) for line in stream]
+
+        with open(self.path('errors.jsonl')) as stream:
+            errors = [json.loads(line) for line in stream]
+
+        self.assertEqual(5, len(rows))
+        self.assertEqual({'pid': 'S0002'}, rows[2])
+        self.assertEqual({'pid': 'S0003'}, rows[3])
+        self.assertEqual(
+            [(2, 'pubdate'), (3, 'acron')], [(error['index'], error['field']) for error in errors]
+        )
+
+    def test_errors_malformed_record(self):
+
+        with open(self.path('in.jsonl'), 'w') as stream:
+            stream.write(json.dumps(self.records[0]) + '\n')
+            stream.write('[1, 2]\n')
+
+        for options in ([], ['--cache', self.path('legends.db')]):
+            main([
+                self.path('in.jsonl'), '-o', self.path('out.jsonl'), '-s', 'descriptive',
+                '-u', 'url_issue', '-k', 'pid', '--errors', self.path('errors.jsonl')
+            ] + options)
+
+            with open(self.path('out.jsonl')) as stream:
+                rows = [json.loads(line) for line in stream]
+
+            with open(self.path('errors.jsonl')) as stream:
+                errors = [json.loads(line) for line in stream]
+
+            self.assertEqual(2, len(rows))
+            self.assertEqual({'pid': ''}, rows[1])
+            self.assertEqual([(1, None)], [(error['index'], error['field']) for error in errors])
+
+    def test_errors_invalid_json(self):
+
+        with open(self.path('in.jsonl'), 'w') as stream:
+            stream.write(json.dumps(self.records[0]) + '\n')
+            stream.write('{bad json\n')
+            stream.write(json.dumps(self.records[1]) + '\n')
+
+        for options in ([], ['-j', '2', '--chunk-size', '1']):
+            main([
+                self.path('in.jsonl'), '-o', self.path('out.jsonl'), '-k', 'pid',
+                '--errors', self.path('errors.jsonl')
+            ] + options)
+
+            with open(self.path('out.jsonl')) as stream:
+                rows = [json.loads(line) for line in stream]
+
+            with open(self.path('errors.jsonl')) as stream:
+                errors = [json.loads(line) for line in stream]
+
+            self.assertEqual(['S0000', '', 'S0001'], [row['pid'] for row in rows])
+            self.assertEqual([(1, None)], [(error['index'], error['field']) for error in errors])
+            self.assertIn('line 2', errors[0]['reason'])
+
+        with open(os.devnull, 'w') as devnull:
+            with mock.patch('sys.stderr', devnull):
+                with self.assertRaises(SystemExit) as raised:
+                    main([self.path('in.jsonl'), '-o', self.path('out.jsonl')])
+
+        self.assertEqual(2, raised.exception.code)
+
+    def test_jsonl(self):
+
+        with open(self.path('in.jsonl'), 'w') as stream:
+            for record in self.records:
+                stream.write(json.dumps(record) + '\n')
+
+        main([
+            self.path('in.jsonl'), '-o', self.path('out.jsonl'), '-s', 'descriptive',
+            '-s', 'very_short', '-l', 'pt', '-l', 'en', '-u', 'url_article', '-k', 'pid',
+            '-j', '2', '--chunk-size', '2'
+        ])
+
+        with open(self.path('out.jsonl')) as stream:
+            rows = [json.loads(line) for line in stream]
+
+        fields = dict((k, v) for k, v in self.records[3].items() if k not in ('pid', 'acron', 'year_pub'))
+
+        self.assertEqual(5, len(rows))
+        self.assertEqual(
+            ['pid', 'descriptive_pt', 'descriptive_en', 'very_short_pt', 'very_short_en', 'url_article'],
+            list(rows[3])
+        )
+        self.assertEqual('S0003', rows[3]['pid'])
+        self.assertEqual(descriptive_format(language='pt', **fields), rows[3]['descriptive_pt'])
+        self.assertEqual(
+            very_short_format(pubdate='2011-12-31', volume='67', number='9'),
+            rows[3]['very_short_en']
+        )
+        self.assertEqual(
+            URLegendarium(acron='spm', year_pub='2011', volume='67', number='9', fpage='31', lpage='39').url_article,
+            rows[3]['url_article']
+        )
+
+    def test_csv(self):
+
+        with open(self.path('in.csv'), 'w', newline='') as stream:
+            writer = csv.DictWriter(stream, list(self.records[0]))
+            writer.writeheader()
+            writer.writerows(self.records)
+
+        main([self.path('in.csv'), '-o', self.path('out.csv'), '-k', 'pid'])
+
+        with open(self.path('out.csv'), newline='') as stream:
+            rows = list(csv.DictReader(stream))
+
+        fields = dict((k, v) for k, v in self.records[0].items() if k not in ('pid', 'acron', 'year_pub'))
+
+        self.assertEqual(['pid', 'descriptive_en'], list(rows[0]))
+        self.assertEqual(descriptive_format(**fields), rows[0]['descriptive_en'])
+
+    def test_unknown_language(self):
+
+        with open(self.path('in.jsonl'), 'w') as stream:
+            stream.write(json.dumps(self.records[0]) + '\n')
+
+        with open(os.devnull, 'w') as devnull:
+            with mock.patch('sys.stderr', devnull):
+                with self.assertRaises(SystemExit) as raised:
+                    main([self.path('in.jsonl'), '-l', 'xx', '-j', '2'])
+
+        self.assertEqual(2, raised.exception.code)
+
+
+if __name__ == "__main__":
+    unittest.main()
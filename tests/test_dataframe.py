@@ -0,0 +1,72 @@
+# coding: utf-8
+import unittest
+
+from legendarium.formatter import descriptive_short_format, very_short_format
+
+try:
+    import pandas as pd
+    import legendarium.dataframe  # noqa: F401 registers df.legendarium
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(pd is None, 'pandas is not installed')
+class TestLegendariumAccessor(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame(
+            {
+                'journal_title': [u'Revista Mal-Estar Subjetivo', u'Cadernos Pagu', u'Cadernos Pagu'],
+                'pubdate': [u'2011', u'2017-03', u'2017-03'],
+                'volume': [u'67', None, None],
+                'number': [u'9', u'50', u'50'],
+                'suppl': [u'3', float('nan'), float('nan')]
+            },
+            index=[10, 20, 30]
+        )
+
+    def test_style_method(self):
+
+        result = self.frame.legendarium.very_short(language='pt')
+
+        self.assertEqual([10, 20, 30], list(result.index))
+        self.assertEqual(
+            [
+                very_short_format(pubdate='2011', volume='67', number='9', suppl='3', language='pt'),
+                very_short_format(pubdate='2017-03', number='50', language='pt'),
+                very_short_format(pubdate='2017-03', number='50', language='pt')
+            ],
+            result.tolist()
+        )
+
+    def test_columns_mapping(self):
+
+        result = self.frame.legendarium.descriptive_short(columns={'title': 'journal_title'})
+
+        self.assertEqual(
+            descriptive_short_format(title='Cadernos Pagu', pubdate='2017-03', number='50'),
+            result[20]
+        )
+
+    def test_integer_column_with_missing_values(self):
+
+        frame = pd.DataFrame({'pubdate': [u'2011', u'2012'], 'volume': [67, float('nan')]})
+
+        self.assertEqual(['2011, 67', '2012,'], frame.legendarium.very_short().tolist())
+
+    def test_nullable_integer_column(self):
+
+        frame = pd.DataFrame({
+            'pubdate': [u'2011', u'2012'], 'volume': pd.array([67, None], dtype='Int64')
+        })
+
+        self.assertEqual(['2011, 67', '2012,'], frame.legendarium.very_short().tolist())
+
+    def test_unknown_style(self):
+
+        with self.assertRaises(ValueError):
+            self.frame.legendarium.render('long')
+
+
+if __name__ == "__main__":
+    unittest.main()
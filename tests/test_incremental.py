@@ -0,0 +1,188 @@
+# coding: utf-8
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from legendarium.formatter import descriptive_format
+from legendarium.incremental import (
+    Change,
+    IncrementalRender,
+    main,
+    read_manifest,
+    write_manifest
+)
+from legendarium.urlegendarium import URLegendarium
+
+
+class TestIncrementalRender(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = [
+            {
+                'pid': 'S%04d' % i,
+                'acron': 'spm',
+                'title': u'Revista Mal-Estar Subjetivo',
+                'pubdate': u'2011-12-31',
+                'year_pub': u'2011',
+                'volume': u'67',
+                'number': u'9',
+                'fpage': str(i * 10 + 1),
+                'lpage': str(i * 10 + 9)
+            }
+            for i in range(4)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def run_delta(self, manifest, records, **options):
+
+        run = IncrementalRender(manifest, ['descriptive'], ['pt'], ['url_issue'], **options)
+
+        return run, list(run.delta(records))
+
+    def test_first_run_adds_everything(self):
+
+        run, changes = self.run_delta({}, self.records)
+        record = self.records[1]
+
+        self.assertEqual([u'added'] * 4, [change.op for change in changes])
+        self.assertEqual(
+            Change(u'added', 'S0001', {
+                'descriptive_pt': descriptive_format(
+                    record['title'], pubdate=record['pubdate'], volume=record['volume'],
+                    number=record['number'], fpage=record['fpage'], lpage=record['lpage'],
+                    language='pt'
+                ),
+                'url_issue': URLegendarium(
+                    acron='spm', year_pub='2011', volume='67', number='9').url_issue
+            }),
+            changes[1]
+        )
+        self.assertEqual(4, len(run.manifest))
+
+    def test_delta(self):
+
+        first, changes = self.run_delta({}, self.records)
+
+        records = [dict(record) for record in self.records[1:]]
+        records[0]['fpage'] = u'500'
+        records[1]['year_pub'] = u'2012'
+        records.append(dict(self.records[0], pid='S0100'))
+
+        rendered = []
+        second = IncrementalRender(first.manifest, ['descriptive'], ['pt'], ['url_issue'])
+
+        def render(changed):
+            rendered.extend(changed)
+            return second.render(rendered)
+
+        changes = list(second.delta(records, render))
+
+        self.assertEqual(
+            [(u'changed', 'S0001'), (u'changed', 'S0002'), (u'added', 'S0100'),
+             (u'removed', 'S0000')],
+            [(change.op, change.id) for change in changes]
+        )
+        self.assertEqual(['descriptive_pt'], list(changes[0].outputs))
+        self.assertEqual(['url_issue'], list(changes[1].outputs))
+        self.assertEqual(json.loads(first.manifest['S0000'][1]), changes[3].outputs)
+        self.assertEqual(
+            {'added': 1, 'changed': 2, 'removed': 1, 'unchanged': 1, 'failed': 0},
+            second.counts
+        )
+        self.assertEqual(['S0001', 'S0002', 'S0100'], [record['pid'] for record in rendered])
+        self.assertEqual(
+            sorted(['S0001', 'S0002', 'S0003', 'S0100']), sorted(second.manifest)
+        )
+
+    def test_lenient_keeps_previous_entry(self):
+
+        first, changes = self.run_delta({}, self.records)
+
+        records = [dict(record) for record in self.records]
+        records[1]['pubdate'] = u'2011-13'
+        records.append(dict(self.records[0], pid='S0100', year_pub=u'11'))
+
+        second, changes = self.run_delta(first.manifest, records, lenient=True)
+
+        self.assertEqual([], changes)
+        self.assertEqual(
+            [('S0001', 'pubdate'), ('S0100', 'year_pub')],
+            [error[:2] for error in second.errors]
+        )
+        self.assertEqual(2, second.counts['failed'])
+        self.assertEqual(first.manifest, second.manifest)
+
+    def test_unchanged_records_are_not_rendered(self):
+
+        first, changes = self.run_delta({}, self.records)
+
+        run = IncrementalRender(first.manifest, ['descriptive'], ['pt'], ['url_issue'])
+        rendered = list(run.changed_records(self.records))
+
+        self.assertEqual([], rendered)
+        self.assertEqual(first.manifest, run.manifest)
+
+    def test_other_options_render_everything(self):
+
+        first, changes = self.run_delta({}, self.records)
+
+        run = IncrementalRender(first.manifest, ['descriptive'], ['en'], ['url_issue'])
+
+        self.assertEqual(4, len(list(run.changed_records(self.records))))
+
+    def test_invalid_ids(self):
+
+        with self.assertRaises(ValueError):
+            self.run_delta({}, [{'title': u'Revista'}])
+
+        with self.assertRaises(ValueError):
+            self.run_delta({}, self.records + self.records[:1])
+
+    def test_manifest_file(self):
+
+        run, changes = self.run_delta({}, self.records)
+
+        write_manifest(run.manifest, self.path('manifest.tsv'))
+
+        self.assertEqual(run.manifest, read_manifest(self.path('manifest.tsv')))
+        self.assertEqual({}, read_manifest(self.path('missing.tsv')))
+
+    def test_main(self):
+
+        def write(records):
+            with open(self.path('in.jsonl'), 'w') as stream:
+                for record in records:
+                    stream.write(json.dumps(record) + '\n')
+
+        arguments = [
+            self.path('in.jsonl'), '-o', self.path('delta.jsonl'), '-s', 'descriptive',
+            '-l', 'pt', '-u', 'url_article', '--manifest', self.path('manifest.tsv')
+        ]
+
+        write(self.records)
+        main(arguments)
+
+        records = [dict(record) for record in self.records[:3]]
+        records[2]['lpage'] = u'99'
+        write(records)
+        main(arguments + ['-j', '2', '--chunk-size', '1'])
+
+        with open(self.path('delta.jsonl')) as stream:
+            rows = [json.loads(line) for line in stream]
+
+        self.assertEqual(
+            [('changed', 'S0002'), ('removed', 'S0003')],
+            [(row['op'], row['pid']) for row in rows]
+        )
+        self.assertEqual(
+            ['op', 'pid', 'descriptive_pt', 'url_article'], list(rows[0])
+        )
+        self.assertEqual(3, len(read_manifest(self.path('manifest.tsv'))))
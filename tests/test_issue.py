@@ -0,0 +1,96 @@
+# coding: utf-8
+import unittest
+from unittest import mock
+
+from legendarium.formatter import (
+    compile_format,
+    descriptive_format,
+    descriptive_html_format
+)
+from legendarium.issue import IssueLegend
+
+ISSUE = dict(
+    title='Revista Mal-Estar Subjetivo',
+    short_title='Rev.Mal-Estar Subj',
+    pubdate='2011-12-31',
+    volume='67',
+    number='9'
+)
+
+ARTICLES = [
+    ('154', '200', ''),
+    ('201', '', ''),
+    ('', '', 'e00120416'),
+    ('210', '220', 'e00120417'),
+    ('', '', '')
+]
+
+
+class TestIssueLegend(unittest.TestCase):
+
+    def test_same_as_format_functions(self):
+
+        for suppl in ('', '0', '3'):
+            for language in ('pt', 'es', 'en'):
+                legend = IssueLegend(suppl=suppl, language=language, **ISSUE)
+
+                for fpage, lpage, elocation in ARTICLES:
+                    fields = dict(ISSUE, fpage=fpage, lpage=lpage, elocation=elocation,
+                                  suppl=suppl, language=language)
+
+                    self.assertEqual(
+                        descriptive_format(**fields),
+                        legend.article(fpage, lpage, elocation)
+                    )
+                    self.assertEqual(
+                        descriptive_html_format(**fields),
+                        legend.article(fpage, lpage, elocation, 'descriptive_html')
+                    )
+
+    def test_article(self):
+
+        legend = IssueLegend(language='pt', **ISSUE)
+
+        self.assertEqual(
+            u'Revista Mal-Estar Subjetivo, Volume: 67, Número: 9, Páginas: 154-200, '
+            u'Publicado: 31 DEZ 2011',
+            legend.article('154', '200')
+        )
+        self.assertEqual(
+            u'Revista Mal-Estar Subjetivo, Volume: 67, Issue: 9, Article number: e1, '
+            u'Published: 31 DEC 2011',
+            legend.article(elocation=' e1 ', language='en')
+        )
+
+    def test_issue_rendered_once(self):
+
+        legend = IssueLegend(**ISSUE)
+        legend.article('1', '10')
+
+        with mock.patch('legendarium.issue.STYLE_TEMPLATES') as templates:
+            legend.article('11', '20')
+            legend.article('21', '30')
+
+        self.assertFalse(templates.called)
+
+    def test_unknown_style(self):
+
+        with self.assertRaises(ValueError):
+            IssueLegend(**ISSUE).article('1', '10', style='short')
+
+    def test_invalid_pubdate(self):
+
+        with self.assertRaises(ValueError):
+            IssueLegend(pubdate='2011-13')
+
+
+class TestCompiledFormatSplit(unittest.TestCase):
+
+    def test_split(self):
+
+        values = {'%T': 'Revista', '%p': '1-10', '%D': '2011'}
+
+        self.assertEqual(
+            (' Revista, pages: ', ', published: 2011 '),
+            compile_format(' %T, pages: %p, published: %D ').split('%p', values)
+        )
@@ -0,0 +1,155 @@
+# coding: utf-8
+import pickle
+import unittest
+
+from legendarium.batch import CitationBatch
+from legendarium.cli import render_outputs
+from legendarium.formatter import (
+    CitationFormatter,
+    descriptive_format,
+    format_many,
+    format_styles,
+    short_format
+)
+from legendarium.issue import IssueLegend
+from legendarium.journal import JournalContext
+from legendarium.store import LegendStore
+from legendarium.urlegendarium import URLegendarium, url_many
+
+
+class TestJournalContext(unittest.TestCase):
+
+    def setUp(self):
+        self.journal = JournalContext(
+            u' Revista Mal-Estar Subjetivo ', u'Rev.Mal-Estar Subj', u'rmes '
+        )
+
+    def test_normalized(self):
+
+        self.assertEqual(u'Revista Mal-Estar Subjetivo', self.journal.title)
+        self.assertEqual(u'Rev.Mal-Estar Subj', self.journal.short_title)
+        self.assertEqual(u'rmes', self.journal.acronym)
+
+    def test_shared(self):
+
+        self.assertIs(
+            self.journal,
+            JournalContext(u'Revista Mal-Estar Subjetivo', u'Rev.Mal-Estar Subj ', u'rmes')
+        )
+        self.assertIsNot(self.journal, JournalContext(u'Revista', u'Rev', u'rmes'))
+
+    def test_immutable(self):
+
+        with self.assertRaises(AttributeError):
+            self.journal.title = u'Revista'
+
+    def test_pickle(self):
+
+        self.assertIs(self.journal, pickle.loads(pickle.dumps(self.journal)))
+
+    def test_citation_formatter(self):
+
+        citation = CitationFormatter(pubdate='2011', journal=self.journal)
+
+        self.assertIs(self.journal.title, citation.title)
+        self.assertIs(self.journal.short_title, citation.short_title)
+
+    def test_format_functions(self):
+
+        self.assertEqual(
+            descriptive_format(
+                u'Revista Mal-Estar Subjetivo', u'Rev.Mal-Estar Subj', '2011', '67', '9',
+                '154', '200', language='pt'
+            ),
+            descriptive_format(
+                pubdate='2011', volume='67', number='9', fpage='154', lpage='200',
+                language='pt', journal=self.journal
+            )
+        )
+        self.assertEqual(
+            u'Rev.Mal-Estar Subj, 2011 67(9)',
+            short_format(pubdate='2011', volume='67', number='9', journal=self.journal)
+        )
+        self.assertEqual(
+            u'Rev.Mal-Estar Subj, 2011 67',
+            format_styles(['short'], pubdate='2011', volume='67', journal=self.journal)['short']
+        )
+
+    def test_issue_legend(self):
+
+        legend = IssueLegend(pubdate='2011', volume='67', journal=self.journal)
+
+        self.assertEqual(
+            descriptive_format(u'Revista Mal-Estar Subjetivo', pubdate='2011', volume='67',
+                               fpage='1', lpage='10'),
+            legend.article('1', '10')
+        )
+
+    def test_urlegendarium(self):
+
+        url = URLegendarium(year_pub='2011', volume='67', journal=self.journal)
+
+        self.assertEqual(u'rmes/2011.v67', url.url_issue)
+
+    def test_format_many(self):
+
+        records = [
+            {'journal': self.journal, 'pubdate': '2011', 'volume': '67'},
+            {'title': u'Cadernos Pagu', 'pubdate': '2017'},
+            (u'Cadernos Pagu', u'Cad. Pagu', '2017'),
+        ]
+        expected = [
+            descriptive_format(pubdate='2011', volume='67', journal=self.journal),
+            descriptive_format(u'Cadernos Pagu', pubdate='2017'),
+            descriptive_format(u'Cadernos Pagu', pubdate='2017'),
+        ]
+
+        self.assertEqual(expected, list(format_many(records, 'descriptive')))
+        self.assertEqual(expected, list(format_many(records, 'descriptive', errors=[])))
+
+        with LegendStore(':memory:') as store:
+            self.assertEqual(expected, list(format_many(records, 'descriptive', store=store)))
+
+        self.assertEqual(
+            [u'Rev.Mal-Estar Subj, 2011 67'], list(format_many(records[:1], 'short'))
+        )
+
+    def test_url_many(self):
+
+        records = [{'journal': self.journal, 'year_pub': '2011', 'volume': '67'}]
+
+        self.assertEqual([u'rmes/2011.v67'], list(url_many(records, 'url_issue')))
+
+    def test_citation_batch(self):
+
+        records = [
+            {'journal': self.journal, 'pubdate': '2011', 'volume': '67'},
+            {'title': u'Cadernos Pagu', 'pubdate': '2017'},
+        ]
+
+        self.assertEqual(
+            list(format_many(records, 'descriptive')),
+            CitationBatch.from_records(records).render('descriptive')
+        )
+
+    def test_command_line_records(self):
+
+        record = {
+            'journal': {'title': self.journal.title, 'acronym': self.journal.acronym},
+            'pubdate': '2011', 'year_pub': '2011', 'volume': '67'
+        }
+
+        row = render_outputs([record], ['descriptive'], ['en'], ['url_issue'])[0]
+
+        self.assertEqual(
+            {
+                'descriptive_en': descriptive_format(
+                    u'Revista Mal-Estar Subjetivo', pubdate='2011', volume='67'),
+                'url_issue': u'rmes/2011.v67'
+            },
+            row
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# coding: utf-8
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from legendarium import languages
+from legendarium.formatter import (
+    descriptive_format,
+    descriptive_very_short_format,
+    very_short_format
+)
+from legendarium.languages import (
+    LanguageNotFound,
+    available_languages,
+    compile_pack,
+    labels,
+    register_language
+)
+
+
+def write_mo(path, messages):
+    """
+    Write a GNU gettext catalog with the given msgid -> msgstr mapping.
+    """
+
+    messages = dict(messages, **{'': 'Content-Type: text/plain; charset=UTF-8\n'})
+    ids = sorted(messages)
+    keys = [key.encode('utf-8') for key in ids]
+    values = [messages[key].encode('utf-8') for key in ids]
+
+    start = 7 * 4 + 16 * len(ids)
+    offsets = []
+    data = b''
+
+    for text in keys + values:
+        offsets.append((len(text), start + len(data)))
+        data += text + b'\0'
+
+    with open(path, 'wb') as stream:
+        stream.write(struct.pack(
+            'Iiiiiii', 0x950412de, 0, len(ids), 7 * 4, 7 * 4 + 8 * len(ids), 0, 0
+        ))
+        for length, offset in offsets:
+            stream.write(struct.pack('ii', length, offset))
+        stream.write(data)
+
+
+class TestLanguages(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pack = dict(
+            [(key, key.upper()) for key in languages.LABEL_KEYS],
+            months=['M%d' % month for month in range(1, 13)]
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+        for language in ('xx-json', 'xx-mo', 'xx-dict', 'xx-used'):
+            languages._packs.pop(language, None)
+            languages._bundles.pop(language, None)
+
+    def test_shipped_languages(self):
+
+        self.assertEqual(
+            ['de', 'en', 'es', 'fr', 'it', 'pt'], [
+                language for language in available_languages() if not language.startswith('xx')
+            ]
+        )
+
+        self.assertEqual(
+            u'Revista, Band: 67, Heft: 9, Seiten: 154-200, Veröffentlicht: 31 DEZ 2011',
+            descriptive_format('Revista', 'Rev', '2011-12-31', '67', '9', '154', '200',
+                               language='de')
+        )
+        self.assertEqual(
+            u'Revista, Volume: 67, Numéro: 9, Publié: 31 DÉC 2011',
+            descriptive_format('Revista', 'Rev', '2011-12-31', '67', '9', language='fr')
+        )
+        self.assertEqual(
+            u'2011, 67(9) suppl. 1',
+            very_short_format('2011', '67', '9', '1', language='it')
+        )
+
+    def test_bundle(self):
+
+        bundle = labels('pt')
+
+        self.assertEqual(u'Número do artigo', bundle.article_number)
+        self.assertEqual('DEZ', bundle.months[11])
+        self.assertIs(bundle, labels('pt'))
+
+        with self.assertRaises(AttributeError):
+            bundle.volume = 'Vol'
+
+    def test_unknown_language(self):
+
+        with self.assertRaises(LanguageNotFound) as raised:
+            descriptive_very_short_format('2011-12', '67', language='xx')
+
+        self.assertIsInstance(raised.exception, KeyError)
+        self.assertIn('Language xx not found', str(raised.exception))
+
+        with self.assertRaises(KeyError):
+            labels(None)
+
+        with self.assertRaises(KeyError):
+            labels('../locales/fr')
+
+    def test_register_json(self):
+
+        path = os.path.join(self.directory, 'pack.json')
+        with open(path, 'w') as stream:
+            json.dump(self.pack, stream)
+
+        register_language('xx-json', path)
+
+        self.assertEqual(
+            u'Revista, ISSUE: 9, PUBLISHED: M12 2011',
+            descriptive_format('Revista', pubdate='2011-12', number='9', language='xx-json')
+        )
+        self.assertIn('xx-json', available_languages())
+
+    def test_register_gettext(self):
+
+        path = os.path.join(self.directory, 'pack.mo')
+        write_mo(path, {'Volume': 'Vol', 'Published': 'Pub', 'DEC': 'D12'})
+
+        register_language('xx-mo', path)
+
+        bundle = labels('xx-mo')
+
+        self.assertEqual(('Vol', 'Pub', 'D12'), (bundle.volume, bundle.published, bundle.months[11]))
+        # Untranslated messages fall back to English
+        self.assertEqual(('Issue', 'JAN'), (bundle.issue, bundle.months[0]))
+
+    def test_register_mapping(self):
+
+        register_language('xx-dict', self.pack)
+
+        self.assertEqual('VOLUME', labels('xx-dict').volume)
+
+    def test_register_used_language(self):
+
+        register_language('xx-used', self.pack)
+        labels('xx-used')
+
+        with self.assertRaises(ValueError):
+            register_language('xx-used', self.pack)
+
+    def test_invalid_pack(self):
+
+        with self.assertRaises(ValueError):
+            compile_pack(dict(self.pack, volume=''))
+
+        with self.assertRaises(ValueError):
+            compile_pack(dict(self.pack, months=['JAN']))
+
+    def test_packs_loaded_lazily(self):
+
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'from legendarium import formatter, languages; print(len(languages._bundles))'
+        ], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        self.assertEqual(b'0', output.strip())
@@ -1,8 +1,13 @@
 # coding: utf-8
+import pickle
 import unittest
+from unittest import mock
 
 from legendarium.formatter import (
     CitationFormatter,
+    CompiledFormat,
+    FrozenCitationFormatter,
+    compile_format,
     short_format,
     very_short_format,
     descriptive_format,
@@ -11,7 +16,16 @@ from legendarium.formatter import (
     descriptive_html_format,
     descriptive_html_short_format,
     descriptive_html_very_short_format,
-    get_numbers
+    format_languages,
+    format_many,
+    format_styles,
+    get_numbers,
+    parse_date,
+    clear_result_cache,
+    disable_result_cache,
+    enable_result_cache,
+    result_cache_info,
+    _descriptive_template
 )
 
 
@@ -32,54 +46,64 @@ class TestLegendarium(unittest.TestCase):
 
         self.legendarium = CitationFormatter(**self.sample)
 
-    @unittest.skip("Retirar setlocale do teste")
     def test_descriptive_ymd_date_pt(self):
 
-        import locale
-
-        locale.setlocale(locale.LC_TIME, 'pt_BR')
-
         self.sample['pubdate'] = '2011-12-31'
 
-        legendarium = CitationFormatter(**self.sample)
+        legendarium = CitationFormatter(language='pt', **self.sample)
 
         self.assertEqual(
             '31 DEZ 2011',
             legendarium.descriptive_dmy_date
         )
 
-    @unittest.skip("Retirar setlocale do teste")
     def test_descriptive_ymd_date_en(self):
 
-        import locale
-
-        locale.setlocale(locale.LC_TIME, 'en_US')
-
         self.sample['pubdate'] = '2011-12-31'
 
-        legendarium = CitationFormatter(**self.sample)
+        legendarium = CitationFormatter(language='en', **self.sample)
 
         self.assertEqual(
             '31 DEC 2011',
             legendarium.descriptive_dmy_date
         )
 
-    @unittest.skip("Retirar setlocale do teste")
     def test_descriptive_ymd_date_es(self):
 
-        import locale
-
-        locale.setlocale(locale.LC_TIME, 'es_ES')
-
         self.sample['pubdate'] = '2011-12-31'
 
-        legendarium = CitationFormatter(**self.sample)
+        legendarium = CitationFormatter(language='es', **self.sample)
 
         self.assertEqual(
             '31 DIC 2011',
             legendarium.descriptive_dmy_date
         )
 
+    def test_descriptive_ym_date(self):
+
+        self.sample['pubdate'] = '2011-03'
+
+        legendarium = CitationFormatter(**self.sample)
+
+        self.assertEqual('MAR 2011', legendarium.descriptive_dmy_date)
+        self.assertEqual('ABR 2011', CitationFormatter(pubdate='2011-04').descriptive_date('pt'))
+
+    def test_descriptive_y_date(self):
+
+        self.assertEqual('2011', self.legendarium.descriptive_dmy_date)
+
+    def test_descriptive_format_month_language(self):
+
+        self.sample['pubdate'] = '2011-12-05'
+        self.sample['elocation'] = ''
+
+        result = descriptive_format(language='es', **self.sample)
+
+        self.assertEqual(
+            'Revista Mal-Estar Subjetivo, Volumen: 67, Numero: 9 Suplemento 3, Páginas: 154-200, Publicado: 05 DIC 2011',
+            result
+        )
+
     def test_format(self):
 
         result = self.legendarium.format('%T, %Y, %v(%n), %p')
@@ -89,6 +113,46 @@ class TestLegendarium(unittest.TestCase):
             result
         )
 
+    def test_format_unknown_pattern(self):
+
+        with self.assertRaises(ValueError):
+            self.legendarium.format('%T, %x')
+
+    def test_compile_format_is_cached(self):
+
+        compiled = compile_format('%T, %Y, %v(%n), %p')
+
+        self.assertIsInstance(compiled, CompiledFormat)
+        self.assertIs(compiled, compile_format('%T, %Y, %v(%n), %p'))
+
+    def test_compiled_format_tokens(self):
+
+        compiled = compile_format('%v(%n) %v')
+
+        self.assertEqual(
+            ((None, '%v'), ('(', None), (None, '%n'), (') ', None), (None, '%v')),
+            compiled.tokens
+        )
+        self.assertEqual(('%v', '%n'), compiled.placeholders)
+        self.assertEqual('67(9) 67', compiled.substitute({'%v': '67', '%n': '9'}))
+
+    def test_format_resolves_only_used_placeholders(self):
+
+        failing = mock.PropertyMock(side_effect=AssertionError('not lazy'))
+
+        with mock.patch.object(CitationFormatter, 'descriptive_dmy_date', failing), \
+                mock.patch.object(CitationFormatter, 'pages', failing):
+            result = self.legendarium.format('%t, %Y')
+            very_short = very_short_format(pubdate='2011', volume='67', number='9')
+
+        self.assertEqual('Rev.Mal-Estar Subj, 2011', result)
+        self.assertEqual('2011, 67(9)', very_short)
+        failing.assert_not_called()
+
+    def test_format_escapes_braces(self):
+
+        self.assertEqual('{2011} 67', self.legendarium.format('{%Y} %v'))
+
     def test_very_short_format(self):
 
         del(self.sample['title'])
@@ -305,6 +369,19 @@ class TestLegendarium(unittest.TestCase):
             result
         )
 
+    def test_descriptive_format_template_is_reused(self):
+
+        template = _descriptive_template('en', True, True, True, False, True, True)
+
+        self.assertIs(
+            template,
+            _descriptive_template('en', True, True, True, False, True, True)
+        )
+        self.assertEqual(
+            '%T, Volume: %v, Issue: %n Supplement %s, Article number: %e, Published: %D',
+            template.fmt_spec
+        )
+
     def test_descriptive_format_1(self):
 
         self.sample['elocation'] = ''
@@ -491,6 +568,157 @@ class TestLegendarium(unittest.TestCase):
             result
         )
 
+    def test_format_many(self):
+
+        records = [
+            self.sample,
+            dict(self.sample, elocation='', acron='spm'),
+            ('Cadernos Pagu', 'Cad. Pagu', '2017', '', '50', '', '', 'e175002', ''),
+        ]
+
+        result = list(format_many(records, 'descriptive', language='en'))
+
+        self.assertEqual(
+            [
+                descriptive_format(**self.sample),
+                'Revista Mal-Estar Subjetivo, Volume: 67, Issue: 9 Supplement 3, Pages: 154-200, Published: 2011',
+                'Cadernos Pagu, Issue: 50, Article number: e175002, Published: 2017'
+            ],
+            result
+        )
+
+    def test_format_many_short(self):
+
+        result = list(format_many([self.sample], 'short'))
+
+        self.assertEqual(['Rev.Mal-Estar Subj, 2011 67(9) suppl 3'], result)
+
+    def test_format_many_short_tuple(self):
+
+        self.assertEqual(['2011, 67'], list(format_many([('2011', '67')], 'very_short', 'pt')))
+        self.assertEqual(
+            ['Rev, Published: 2011'], list(format_many([('Rev', 'R', '2011')], 'descriptive'))
+        )
+
+    def test_format_many_previous_record_normalized(self):
+
+        records = [
+            {'pubdate': '2011', 'volume': 67.0},
+            {'pubdate': '2011', 'volume': 67},
+            {'pubdate': '2011', 'volume': ' 67 '},
+        ]
+
+        self.assertEqual(
+            ['2011, 67.0', '2011, 67', '2011, 67'], list(format_many(records, 'very_short'))
+        )
+        self.assertEqual(
+            ['2011, 67.0', '2011, 67'], list(format_many(records[:2], 'very_short', errors=[]))
+        )
+
+    def test_format_many_lenient(self):
+
+        records = [
+            self.sample,
+            dict(self.sample, pubdate='2011-13'),
+            dict(self.sample, pubdate='2011-13'),
+            dict(self.sample, title=['Revista']),
+        ]
+        errors = []
+
+        result = list(format_many(records, 'descriptive', errors=errors))
+
+        self.assertEqual([descriptive_format(**self.sample), None, None, None], result)
+        self.assertEqual([1, 2, 3], [error.index for error in errors])
+        self.assertEqual(['pubdate', 'pubdate', 'title'], [error.field for error in errors])
+
+        with self.assertRaises(ValueError):
+            list(format_many(records, 'descriptive'))
+
+    def test_format_many_lenient_malformed(self):
+
+        records = [{'pubdate': '2011'}, None, 2011, {'pubdate': '2012'}]
+        errors = []
+
+        result = list(format_many(records, 'very_short', errors=errors))
+
+        self.assertEqual(['2011,', None, None, '2012,'], result)
+        self.assertEqual([(1, None), (2, None)], [error[:2] for error in errors])
+
+        with self.assertRaises(TypeError):
+            list(format_many(records, 'very_short'))
+
+    def test_format_many_unknown_style(self):
+
+        with self.assertRaises(ValueError):
+            list(format_many([self.sample], 'long'))
+
+    def test_format_styles(self):
+
+        self.sample['pubdate'] = '2011-12-31'
+
+        result = format_styles(language='pt', **self.sample)
+
+        issue = dict(self.sample)
+        for field in ('title', 'short_title', 'fpage', 'lpage', 'elocation'):
+            del(issue[field])
+
+        self.assertEqual(very_short_format(language='pt', **issue), result['very_short'])
+        self.assertEqual(
+            descriptive_format(language='pt', **self.sample),
+            result['descriptive']
+        )
+        self.assertEqual(
+            descriptive_html_format(language='pt', **self.sample),
+            result['descriptive_html']
+        )
+        self.assertEqual(
+            descriptive_html_very_short_format(language='pt', **issue),
+            result['descriptive_html_very_short']
+        )
+
+    def test_format_styles_selected(self):
+
+        self.sample['suppl'] = '0'
+
+        result = format_styles(styles=['short', 'descriptive_short'], **self.sample)
+
+        self.assertEqual(
+            {
+                'short': 'Rev.Mal-Estar Subj, 2011 67(9) suppl',
+                'descriptive_short': 'Revista Mal-Estar Subjetivo, Volume: 67, Issue: 9 Supplement, Published: 2011'
+            },
+            result
+        )
+
+    def test_format_styles_unknown_field(self):
+
+        with self.assertRaises(TypeError):
+            format_styles(['short'], pubdate='2011', titel='Revista')
+
+        with self.assertRaises(TypeError):
+            format_languages(['very_short'], pubdate='2011', language='pt')
+
+    def test_format_languages(self):
+
+        self.sample['pubdate'] = '2011-12-31'
+
+        result = format_languages(styles=['descriptive', 'very_short'], **self.sample)
+
+        issue = dict([(k, self.sample[k]) for k in ('pubdate', 'volume', 'number', 'suppl')])
+
+        self.assertEqual(['pt', 'es', 'en'], list(result))
+
+        for language in ('pt', 'es', 'en'):
+            self.assertEqual(
+                {
+                    'descriptive': descriptive_format(language=language, **self.sample),
+                    'very_short': very_short_format(language=language, **issue)
+                },
+                result[language]
+            )
+
+        self.assertTrue(result['pt']['descriptive'].endswith('Publicado: 31 DEZ 2011'))
+
     def test_pages(self):
         result = self.legendarium.pages
 
@@ -546,6 +774,49 @@ class TestLegendarium(unittest.TestCase):
             result
         )
 
+    def test_citation_formatter_has_no_instance_dict(self):
+
+        self.assertFalse(hasattr(self.legendarium, '__dict__'))
+
+    def test_frozen_equal_by_normalized_fields(self):
+
+        first = FrozenCitationFormatter('Revista', ' Rev ', '2011-2-3', 67, '9')
+        second = FrozenCitationFormatter('Revista', 'Rev', '2011-02-03', '67', '9 ')
+        other = FrozenCitationFormatter('Revista', 'Rev', '2011-02-03', '67', '9', language='pt')
+
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, other)
+        self.assertEqual(2, len(set([first, second, other])))
+
+    def test_frozen_is_immutable(self):
+
+        citation = FrozenCitationFormatter('Revista', 'Rev', '2011')
+
+        with self.assertRaises(AttributeError):
+            citation._title = 'Other'
+
+        with self.assertRaises(AttributeError):
+            del citation._title
+
+        self.assertEqual('Revista', citation.title)
+
+    def test_frozen_memoizes_format(self):
+
+        citation = FrozenCitationFormatter('Revista', 'Rev', '2011', '67', '9', language='pt')
+
+        with mock.patch('legendarium.formatter.compile_format', wraps=compile_format) as compiled:
+            self.assertEqual('Rev 2011;67(9)', citation.format('%t %Y;%v(%n)'))
+            self.assertEqual('Rev 2011;67(9)', format(citation, '%t %Y;%v(%n)'))
+
+        self.assertEqual(1, compiled.call_count)
+
+    def test_frozen_pickle(self):
+
+        citation = FrozenCitationFormatter('Revista', 'Rev', '2011-12', '67', suppl='0')
+
+        self.assertEqual(citation, pickle.loads(pickle.dumps(citation)))
+
     def test_get_numbers_1(self):
 
         result = get_numbers('v22')
@@ -564,6 +835,98 @@ class TestLegendarium(unittest.TestCase):
 
         self.assertEqual('', result)
 
+    def test_result_cache_disabled_by_default(self):
+
+        self.assertIsNone(result_cache_info())
+
+    def test_result_cache(self):
+
+        enable_result_cache(2)
+        self.addCleanup(disable_result_cache)
+
+        first = very_short_format('2011', '67', '9', language='pt')
+        second = very_short_format(pubdate='2011', volume='67', number='9', language='pt')
+        very_short_format('2011', '67', '9', '', 'pt')
+
+        self.assertEqual(first, second)
+        self.assertEqual((2, 1, 0, 2, 1), tuple(result_cache_info()))
+
+    def test_result_cache_keyed_by_function_and_language(self):
+
+        enable_result_cache(2)
+        self.addCleanup(disable_result_cache)
+
+        very_short_format('2011', '67', '9')
+        descriptive_very_short_format('2011', '67', '9')
+        descriptive_very_short_format('2011', '67', '9', language='pt')
+
+        info = result_cache_info()
+
+        self.assertEqual((0, 3, 1), (info.hits, info.misses, info.evictions))
+
+    def test_result_cache_keyed_by_normalized_values(self):
+
+        enable_result_cache()
+        self.addCleanup(disable_result_cache)
+
+        self.assertEqual('2011, 67.0', very_short_format('2011', 67.0))
+        self.assertEqual('2011, 67', very_short_format('2011', 67))
+        self.assertEqual('2011, 67', very_short_format('2011', ' 67 '))
+        self.assertEqual(1, result_cache_info().hits)
+
+        self.assertEqual(
+            'R, Volume: 1 Supplement, Published: 2011',
+            descriptive_format('R', pubdate='2011', volume='1', suppl='0')
+        )
+        self.assertEqual(
+            'R, Volume: 1 Supplement , Published: 2011',
+            descriptive_format('R', pubdate='2011', volume='1', suppl=' 0')
+        )
+
+    def test_result_cache_clear(self):
+
+        enable_result_cache()
+        self.addCleanup(disable_result_cache)
+
+        short_format('Revista', 'Rev', '2011')
+        clear_result_cache()
+
+        info = result_cache_info()
+
+        self.assertEqual((0, 0, 0, 0), (info.hits, info.misses, info.evictions, info.currsize))
+
+    def test_result_cache_errors_not_cached(self):
+
+        enable_result_cache()
+        self.addCleanup(disable_result_cache)
+
+        for attempt in range(2):
+            with self.assertRaises(ValueError):
+                very_short_format('2011-13')
+
+        self.assertEqual(0, result_cache_info().currsize)
+
+    def test_parse_date(self):
+
+        self.assertEqual('2011', parse_date('2011'))
+        self.assertEqual('2011-12', parse_date('2011-12'))
+        self.assertEqual('2011-01', parse_date('2011-1'))
+        self.assertEqual('2011-12-31', parse_date('2011-12-31'))
+
+    def test_parse_date_scielo_variants(self):
+
+        self.assertEqual('2011-12-31', parse_date('20111231'))
+        self.assertEqual('2011', parse_date('2011-00-00'))
+        self.assertEqual('2011-12', parse_date('2011-12-00'))
+        self.assertEqual('2011-12-31', parse_date('2011-12-31T10:20:30Z'))
+        self.assertEqual('2011-12-31', parse_date('2011-12-31 10:20:30'))
+
+    def test_parse_date_invalid(self):
+
+        for value in ('', '201', '2011-13', '2011-02-29', '2011 10:00', '2011\n', 'abcd', None):
+            with self.assertRaises(ValueError):
+                parse_date(value)
+
     def test_build_raw_format(self):
         result = self.legendarium.rawformat
 
@@ -0,0 +1,98 @@
+# coding: utf-8
+import threading
+import unittest
+
+from legendarium.formatter import format_many
+from legendarium.parallel import chunks, render_parallel, render_threaded
+from legendarium.urlegendarium import url_many
+from tests.sample import records
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_chunks(self):
+
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6]], list(chunks(range(7), 3)))
+
+    def test_render_parallel(self):
+
+        data = records(50)
+
+        result = list(render_parallel(data, 'descriptive', 'pt', workers=2, chunk_size=7))
+
+        self.assertEqual(list(format_many(data, 'descriptive', 'pt')), result)
+
+    def test_render_parallel_urls(self):
+
+        data = records(20)
+
+        result = list(render_parallel(data, 'url_article', workers=2, chunk_size=3, max_in_flight=1))
+
+        self.assertEqual(list(url_many(data, 'url_article')), result)
+
+    def test_render_parallel_unknown_style(self):
+
+        with self.assertRaises(ValueError):
+            list(render_parallel(records(1), 'long', workers=1))
+
+    def test_render_parallel_lenient(self):
+
+        data = records(20)
+        data[4]['pubdate'] = data[13]['pubdate'] = '2011-13'
+        errors = []
+
+        result = list(render_parallel(
+            data, 'descriptive', workers=2, chunk_size=3, errors=errors))
+
+        self.assertEqual(list(format_many(data, 'descriptive', errors=[])), result)
+        self.assertEqual([(4, 'pubdate'), (13, 'pubdate')], [error[:2] for error in errors])
+
+    def test_render_threaded_lenient_urls(self):
+
+        data = records(20)
+        data[7]['year_pub'] = '11'
+        errors = []
+
+        result = list(render_threaded(data, 'url_issue', workers=2, chunk_size=3, errors=errors))
+
+        self.assertEqual(None, result[7])
+        self.assertEqual([(7, 'year_pub')], [error[:2] for error in errors])
+
+    def test_render_threaded(self):
+
+        data = records(50)
+
+        result = list(render_threaded(data, 'descriptive_html', 'es', workers=4, chunk_size=3))
+
+        self.assertEqual(list(format_many(data, 'descriptive_html', 'es')), result)
+
+    def test_render_threaded_under_contention(self):
+
+        data = records(200)
+        expected = dict(
+            (language, list(format_many(data, 'descriptive', language)))
+            for language in ('pt', 'es', 'en')
+        )
+        results = {}
+
+        def work(language, index):
+            results[(language, index)] = list(
+                render_threaded(data, 'descriptive', language, workers=4, chunk_size=5)
+            )
+
+        threads = [
+            threading.Thread(target=work, args=(language, index))
+            for language in ('pt', 'es', 'en') for index in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for (language, index), result in results.items():
+            self.assertEqual(expected[language], result)
+        self.assertEqual(9, len(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# coding: utf-8
+import os
+import shutil
+import tempfile
+import unittest
+
+from legendarium.formatter import descriptive_format, very_short_format
+
+try:
+    import pyarrow.parquet as pq
+    from legendarium.parquet import legend_batches, write_parquet
+except ImportError:
+    pq = None
+
+
+@unittest.skipIf(pq is None, 'pyarrow is not installed')
+class TestParquetWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {
+                'pid': 'S0001-%04d' % i,
+                'title': u'Revista Mal-Estar Subjetivo',
+                'pubdate': u'2011',
+                'volume': u'67',
+                'number': u'9',
+                'fpage': str(i * 10 + 1),
+                'lpage': str(i * 10 + 9)
+            }
+            for i in range(25)
+        ]
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_legend_batches_size(self):
+
+        batches = list(legend_batches(self.records, ['very_short'], batch_size=10))
+
+        self.assertEqual([10, 10, 5], [batch.num_rows for batch in batches])
+
+    def test_write_parquet(self):
+
+        path = os.path.join(self.directory, 'legends.parquet')
+
+        rows = write_parquet(
+            self.records, path, ['descriptive', 'very_short'], languages=['pt', 'en'],
+            keep=['pid'], batch_size=10
+        )
+
+        table = pq.read_table(path)
+        fields = dict((k, v) for k, v in self.records[3].items() if k != 'pid')
+
+        self.assertEqual(25, rows)
+        self.assertEqual(
+            ['pid', 'descriptive_pt', 'descriptive_en', 'very_short_pt', 'very_short_en'],
+            table.column_names
+        )
+        self.assertEqual('S0001-0003', table.column('pid')[3].as_py())
+        self.assertEqual(
+            descriptive_format(language='pt', **fields),
+            table.column('descriptive_pt')[3].as_py()
+        )
+        self.assertEqual(
+            very_short_format(pubdate='2011', volume='67', number='9'),
+            table.column('very_short_en')[24].as_py()
+        )
+
+    def test_write_parquet_failure_leaves_no_file(self):
+
+        path = os.path.join(self.directory, 'legends.parquet')
+        self.records[6]['pubdate'] = '2011-13'
+
+        with self.assertRaises(ValueError):
+            write_parquet(self.records, path, ['very_short'], batch_size=2)
+
+        self.assertEqual([], os.listdir(self.directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# coding: utf-8
+import json
+import threading
+import unittest
+
+from http.client import HTTPConnection
+
+from legendarium.formatter import descriptive_format, very_short_format
+from legendarium.server import make_server
+
+
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server(port=0, quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def setUp(self):
+        self.connection = HTTPConnection('127.0.0.1', self.server.server_address[1])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def request(self, method, path, body=None):
+
+        self.connection.request(method, path, body=body and json.dumps(body))
+        response = self.connection.getresponse()
+
+        return response.status, json.loads(response.read().decode('utf-8'))
+
+    def test_format(self):
+
+        status, data = self.request('GET', '/format/very_short?pubdate=2011&volume=67&number=9&language=pt&suppl=1')
+
+        self.assertEqual(200, status)
+        self.assertEqual(
+            very_short_format(pubdate='2011', volume='67', number='9', suppl='1', language='pt'),
+            data['legend']
+        )
+
+    def test_url(self):
+
+        status, data = self.request('GET', '/url/url_issue?acron=spm&year_pub=2011&volume=67')
+
+        self.assertEqual((200, {'url': 'spm/2011.v67'}), (status, data))
+
+    def test_batch_keeps_connection_alive(self):
+
+        records = [
+            {'pid': 'S%d' % i, 'acron': 'spm', 'title': u'Cadernos Pagu', 'pubdate': u'2017',
+             'year_pub': u'2017', 'number': u'50', 'elocation': u'e%d' % i, 'article_id': u'e%d' % i}
+            for i in range(3)
+        ]
+
+        for _ in range(2):
+            status, data = self.request('POST', '/batch', {
+                'records': records, 'styles': ['descriptive'], 'languages': ['es'],
+                'urls': ['url_article'], 'keep': ['pid']
+            })
+
+        self.assertEqual(200, status)
+        self.assertEqual(
+            {
+                'pid': 'S2',
+                'descriptive_es': descriptive_format(
+                    title='Cadernos Pagu', pubdate='2017', number='50', elocation='e2', language='es'),
+                'url_article': 'spm/2017.n50/e2'
+            },
+            data['results'][2]
+        )
+
+    def test_batch_lenient(self):
+
+        status, data = self.request('POST', '/batch', {
+            'records': [{'pid': 'S1', 'pubdate': '2011'}, {'pid': 'S2', 'pubdate': '2011-13'}],
+            'styles': ['very_short'], 'keep': ['pid'], 'errors': True
+        })
+
+        self.assertEqual(200, status)
+        self.assertEqual([{'pid': 'S1', 'very_short_en': '2011,'}, {'pid': 'S2'}], data['results'])
+        self.assertEqual(
+            [(1, 'pubdate')], [(error['index'], error['field']) for error in data['errors']]
+        )
+
+    def test_errors(self):
+
+        self.assertEqual(400, self.request('GET', '/format/long?pubdate=2011')[0])
+        self.assertEqual(400, self.request('GET', '/format/short?pubdate=20111')[0])
+        self.assertEqual(400, self.request('POST', '/batch', {'styles': ['short']})[0])
+        self.assertEqual(400, self.request('GET', '/format/descriptive?pubdate=2011&journal=x')[0])
+        self.assertEqual(400, self.request('GET', '/url/url_article?acron=x&journal=abc')[0])
+        self.assertEqual(404, self.request('GET', '/legends')[0])
+
+
+    def test_invalid_content_length(self):
+
+        for length in ('abc', '-1'):
+            connection = HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=5)
+            connection.putrequest('POST', '/batch')
+            connection.putheader('Content-Length', length)
+            connection.endheaders()
+            response = connection.getresponse()
+
+            self.assertEqual(400, response.status)
+            self.assertIn('Content-Length', json.loads(response.read().decode('utf-8'))['error'])
+            connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+# coding: utf-8
+import os
+import shutil
+import tempfile
+import unittest
+
+from legendarium import __version__
+from legendarium.formatter import format_many
+from legendarium.store import LegendStore
+
+
+class TestLegendStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'legends.db')
+        self.records = [
+            {
+                'title': u'Revista Mal-Estar Subjetivo',
+                'short_title': u'Rev.Mal-Estar Subj',
+                'pubdate': u'2011-12-31',
+                'volume': u'67',
+                'number': u'9',
+                'fpage': str(i * 10 + 1),
+                'lpage': str(i * 10 + 9)
+            }
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_key(self):
+
+        with LegendStore(':memory:') as store:
+            key = store.key('descriptive', 'pt', ('Revista', '2011', 67, None))
+
+            self.assertEqual(key, store.key('descriptive', 'pt', ('Revista', '2011', '67', '')))
+            self.assertNotEqual(key, store.key('descriptive', 'en', ('Revista', '2011', '67', '')))
+            self.assertNotEqual(key, store.key('descriptive', 'pt', ('Revista', '2011', '68', '')))
+            self.assertEqual(key, LegendStore(':memory:').key(
+                'descriptive', 'pt', ('Revista', '2011', '67', '')))
+            self.assertNotEqual(key, LegendStore(':memory:', version='0').key(
+                'descriptive', 'pt', ('Revista', '2011', '67', '')))
+
+    def test_key_normalized(self):
+
+        fields = ('pubdate', 'volume', 'number', 'suppl')
+
+        with LegendStore(':memory:') as store:
+            key = store.key('very_short', 'en', ('2011', '67', '', ''), fields)
+
+            self.assertEqual(key, store.key('very_short', 'en', ('2011', ' 67 ', None, ''), fields))
+            self.assertNotEqual(key, store.key('very_short', 'en', ('2011', 67.0, '', ''), fields))
+            self.assertNotEqual(key, store.key('very_short', 'en', ('2011 ', '67', '', ''), fields))
+            self.assertNotEqual(
+                store.key('very_short', 'en', ('2011', '67', '', '0'), fields),
+                store.key('very_short', 'en', ('2011', '67', '', ' 0'), fields)
+            )
+
+    def test_format_many_normalized(self):
+
+        records = [
+            {'pubdate': '2011', 'volume': 67.0},
+            {'pubdate': '2011', 'volume': 67},
+            {'pubdate': '2011', 'volume': ' 67'},
+        ]
+
+        with LegendStore(':memory:') as store:
+            result = list(format_many(records, 'very_short', store=store))
+
+            self.assertEqual(['2011, 67.0', '2011, 67', '2011, 67'], result)
+            self.assertEqual(2, len(store))
+
+    def test_get_and_set_many(self):
+
+        with LegendStore(':memory:') as store:
+            store.set_many([(b'a', u'first'), (b'b', u'second')])
+
+            self.assertEqual({b'a': u'first'}, store.get_many([b'a', b'c']))
+            self.assertEqual(2, len(store))
+
+            store.clear()
+
+            self.assertEqual(0, len(store))
+
+    def test_format_many(self):
+
+        expected = list(format_many(self.records, 'descriptive', 'pt'))
+
+        with LegendStore(self.path, batch_size=2) as store:
+            self.assertEqual(expected, list(format_many(self.records, 'descriptive', 'pt', store=store)))
+            self.assertEqual((0, 5), (store.hits, store.misses))
+
+        with LegendStore(self.path) as store:
+            self.assertEqual(expected, list(format_many(self.records, 'descriptive', 'pt', store=store)))
+            self.assertEqual((5, 0), (store.hits, store.misses))
+
+            list(format_many(self.records, 'descriptive', 'en', store=store))
+            list(format_many(self.records, 'short', store=store))
+
+            # The five records share a single short legend
+            self.assertEqual((9, 6), (store.hits, store.misses))
+
+    def test_rendered_once_per_batch(self):
+
+        calls = []
+
+        with LegendStore(':memory:') as store:
+            legends = store.render(
+                'very_short', 'en', [('2011',), ('2012',), ('2011',)],
+                lambda values: calls.append(values) or values[0]
+            )
+
+        self.assertEqual(['2011', '2012', '2011'], legends)
+        self.assertEqual([('2011',), ('2012',)], calls)
+
+    def test_errors_not_stored(self):
+
+        with LegendStore(':memory:') as store:
+            with self.assertRaises(ValueError):
+                list(format_many([{'pubdate': '2011-13'}], 'very_short', store=store))
+
+            self.assertEqual(0, len(store))
+
+    def test_lenient_errors_not_stored(self):
+
+        records = [{'pubdate': '2011'}, {'pubdate': '2011-13'}]
+        errors = []
+
+        with LegendStore(':memory:') as store:
+            result = list(format_many(records, 'very_short', store=store, errors=errors))
+
+            self.assertEqual([None], result[1:])
+            self.assertEqual([(1, 'pubdate')], [error[:2] for error in errors])
+            self.assertEqual(1, len(store))
+
+    def test_lenient_malformed_records(self):
+
+        records = [{'pubdate': '2011'}, None, {'pubdate': '2012'}]
+        errors = []
+
+        with LegendStore(':memory:') as store:
+            result = list(format_many(records, 'very_short', store=store, errors=errors))
+
+            self.assertEqual(['2011,', None, '2012,'], result)
+            self.assertEqual([(1, None)], [error[:2] for error in errors])
+            self.assertEqual(2, len(store))
+
+    def test_new_version_drops_legends(self):
+
+        with LegendStore(self.path) as store:
+            list(format_many(self.records, 'descriptive', 'pt', store=store))
+
+        with LegendStore(self.path, version=__version__ + '.1') as store:
+            self.assertEqual(0, len(store))
+
+    def test_same_version_keeps_legends(self):
+
+        with LegendStore(self.path) as store:
+            list(format_many(self.records, 'descriptive', 'pt', store=store))
+
+        with LegendStore(self.path) as store:
+            self.assertEqual(5, len(store))
@@ -1,7 +1,7 @@
 # coding: utf-8
 import unittest
 
-from legendarium.urlegendarium import URLegendarium
+from legendarium.urlegendarium import URLegendarium, url_many
 
 
 class TestLegendarium(unittest.TestCase):
@@ -164,6 +164,54 @@ class TestLegendarium(unittest.TestCase):
 
         self.assertEqual(u'spm/2011.v67n9/10.1590/0102-6720201600S10001', leg.url_article)
 
+    def test_urlegendarium_has_no_instance_dict(self):
+
+        leg = URLegendarium(**self.dict_leg)
+
+        self.assertFalse(hasattr(leg, '__dict__'))
+
+    def test_url_many(self):
+
+        records = [
+            self.dict_leg,
+            dict(self.dict_leg, article_id='', title='ignored'),
+            ('spm', '2011', '67', '9', '154', '', '200', 'e00120416'),
+        ]
+
+        self.assertEqual(
+            [u'spm/2011.v67n9suppl3/e00120416', u'spm/2011.v67n9suppl3/154-200', u'spm/2011.v67n9/e00120416'],
+            list(url_many(records))
+        )
+        self.assertEqual([u'spm/2011.v67n9suppl3'], list(url_many([self.dict_leg], 'url_issue')))
+
+    def test_url_many_lenient(self):
+
+        records = [
+            self.dict_leg,
+            dict(self.dict_leg, year_pub='11'),
+            dict(self.dict_leg, acron=''),
+        ]
+        errors = []
+
+        result = list(url_many(records, 'url_issue', errors))
+
+        self.assertEqual([u'spm/2011.v67n9suppl3', None, None], result)
+        self.assertEqual([(1, 'year_pub'), (2, 'acron')], [error[:2] for error in errors])
+
+    def test_url_many_lenient_malformed(self):
+
+        errors = []
+
+        result = list(url_many([None, 2011, self.dict_leg], 'url_issue', errors))
+
+        self.assertEqual([None, None, u'spm/2011.v67n9suppl3'], result)
+        self.assertEqual([(0, None), (1, None)], [error[:2] for error in errors])
+
+    def test_url_many_unknown_style(self):
+
+        with self.assertRaises(ValueError):
+            list(url_many([self.dict_leg], 'url_page'))
+
 
 if __name__ == "__main__":
     unittest.main()